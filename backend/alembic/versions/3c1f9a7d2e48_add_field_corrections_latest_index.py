@@ -0,0 +1,29 @@
+"""add field_corrections (document_id, field_name, timestamp desc) index
+
+Revision ID: 3c1f9a7d2e48
+Revises: 84b12b56b29c
+Create Date: 2026-10-17 09:12:41.523817
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '3c1f9a7d2e48'
+down_revision = '84b12b56b29c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Lets DISTINCT ON (field_name) pick the latest correction per field from the index
+    op.create_index(
+        'ix_field_corrections_document_field_timestamp',
+        'field_corrections',
+        ['document_id', 'field_name', sa.text('timestamp DESC')],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_field_corrections_document_field_timestamp', table_name='field_corrections')
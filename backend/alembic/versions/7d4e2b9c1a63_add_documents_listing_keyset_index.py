@@ -0,0 +1,29 @@
+"""add documents (business_id, created_at desc, id desc) index
+
+Revision ID: 7d4e2b9c1a63
+Revises: 3c1f9a7d2e48
+Create Date: 2026-10-17 11:02:17.304518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '7d4e2b9c1a63'
+down_revision = '3c1f9a7d2e48'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Lets document listing seek by (created_at, id) keyset within a business
+    op.create_index(
+        'ix_documents_business_created_at_id',
+        'documents',
+        ['business_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_documents_business_created_at_id', table_name='documents')
@@ -0,0 +1,39 @@
+"""add documents.corrections_count
+
+Revision ID: 9a2c5e7f1b04
+Revises: 7d4e2b9c1a63
+Create Date: 2026-10-17 13:41:05.926381
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '9a2c5e7f1b04'
+down_revision = '7d4e2b9c1a63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'documents',
+        sa.Column('corrections_count', sa.Integer(), nullable=False, server_default='0')
+    )
+    # Backfill from the existing correction history
+    op.execute(
+        """
+        UPDATE documents
+        SET corrections_count = counts.total
+        FROM (
+            SELECT document_id, COUNT(*) AS total
+            FROM field_corrections
+            GROUP BY document_id
+        ) AS counts
+        WHERE documents.id = counts.document_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('documents', 'corrections_count')
@@ -0,0 +1,46 @@
+"""add documents status partial indexes and (business_id, reviewed_at) index
+
+Revision ID: a1d7f3c9e265
+Revises: f4b8d2a6c913
+Create Date: 2026-10-17 17:12:54.338190
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'a1d7f3c9e265'
+down_revision = 'f4b8d2a6c913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Serve the status-filtered dashboard listings (predicate and newest-first
+    # order) from small per-status indexes
+    op.create_index(
+        'ix_docs_business_processing',
+        'documents',
+        ['business_id', sa.text('created_at DESC')],
+        unique=False,
+        postgresql_where=sa.text("status = 'PROCESSING'")
+    )
+    op.create_index(
+        'ix_docs_business_completed',
+        'documents',
+        ['business_id', sa.text('created_at DESC')],
+        unique=False,
+        postgresql_where=sa.text("status = 'COMPLETED'")
+    )
+    op.create_index(
+        'ix_docs_business_reviewed',
+        'documents',
+        ['business_id', 'reviewed_at'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_docs_business_reviewed', table_name='documents')
+    op.drop_index('ix_docs_business_completed', table_name='documents')
+    op.drop_index('ix_docs_business_processing', table_name='documents')
@@ -0,0 +1,37 @@
+"""add documents (business_id, id) covering index
+
+Revision ID: b6e1d3f8a2c7
+Revises: 9a2c5e7f1b04
+Create Date: 2026-10-17 15:08:42.611207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'b6e1d3f8a2c7'
+down_revision = '9a2c5e7f1b04'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Built concurrently so writes to documents are not blocked while it builds
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_documents_business_id_id',
+            'documents',
+            ['business_id', 'id'],
+            unique=False,
+            postgresql_include=['status', 'reviewed_at', 'reviewed_by'],
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_documents_business_id_id',
+            table_name='documents',
+            postgresql_concurrently=True
+        )
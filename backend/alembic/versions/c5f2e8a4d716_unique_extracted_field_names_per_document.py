@@ -0,0 +1,47 @@
+"""make extracted field names unique per document
+
+Revision ID: c5f2e8a4d716
+Revises: a1d7f3c9e265
+Create Date: 2026-10-17 18:04:21.517203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'c5f2e8a4d716'
+down_revision = 'a1d7f3c9e265'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep the oldest row for any duplicated field so the unique index can be built
+    op.execute(
+        """
+        DELETE FROM extracted_fields AS dup
+        USING extracted_fields AS keep
+        WHERE dup.document_id = keep.document_id
+          AND dup.business_id = keep.business_id
+          AND dup.field_name = keep.field_name
+          AND dup.id > keep.id
+        """
+    )
+    # Field corrections upsert on (document_id, business_id, field_name)
+    op.drop_index('ix_extracted_fields_doc_biz_name', table_name='extracted_fields')
+    op.create_index(
+        'ix_extracted_fields_doc_biz_name',
+        'extracted_fields',
+        ['document_id', 'business_id', 'field_name'],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_extracted_fields_doc_biz_name', table_name='extracted_fields')
+    op.create_index(
+        'ix_extracted_fields_doc_biz_name',
+        'extracted_fields',
+        ['document_id', 'business_id', 'field_name'],
+        unique=False
+    )
@@ -0,0 +1,59 @@
+"""make client and project names unique per business
+
+Revision ID: d8b3f1c6e592
+Revises: c5f2e8a4d716
+Create Date: 2026-10-17 18:41:09.274318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'd8b3f1c6e592'
+down_revision = 'c5f2e8a4d716'
+branch_labels = None
+depends_on = None
+
+
+def _merge_duplicates(table: str, document_column: str) -> None:
+    # Point documents at the oldest row of each duplicated name, then drop the rest
+    op.execute(
+        f"""
+        UPDATE documents AS d
+        SET {document_column} = keep.id
+        FROM {table} AS dup
+        JOIN {table} AS keep
+          ON keep.business_id = dup.business_id
+         AND keep.name = dup.name
+         AND keep.id < dup.id
+        WHERE d.{document_column} = dup.id
+          AND NOT EXISTS (
+              SELECT 1 FROM {table} AS older
+              WHERE older.business_id = keep.business_id
+                AND older.name = keep.name
+                AND older.id < keep.id
+          )
+        """
+    )
+    op.execute(
+        f"""
+        DELETE FROM {table} AS dup
+        USING {table} AS keep
+        WHERE dup.business_id = keep.business_id
+          AND dup.name = keep.name
+          AND dup.id > keep.id
+        """
+    )
+
+
+def upgrade() -> None:
+    _merge_duplicates('clients', 'client_id')
+    _merge_duplicates('projects', 'project_id')
+    # Creation inserts with ON CONFLICT (business_id, name) DO NOTHING
+    op.create_unique_constraint('uq_clients_business_id_name', 'clients', ['business_id', 'name'])
+    op.create_unique_constraint('uq_projects_business_id_name', 'projects', ['business_id', 'name'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_projects_business_id_name', 'projects', type_='unique')
+    op.drop_constraint('uq_clients_business_id_name', 'clients', type_='unique')
@@ -0,0 +1,37 @@
+"""replace field_corrections latest index with (document_id, business_id, field_name, timestamp desc)
+
+Revision ID: e3a9c7b5d148
+Revises: b6e1d3f8a2c7
+Create Date: 2026-10-17 16:21:37.480915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'e3a9c7b5d148'
+down_revision = 'b6e1d3f8a2c7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Covers both the document_id and business_id predicates ahead of the
+    # DISTINCT ON ordering, so the older narrower index is dropped
+    op.create_index(
+        'ix_field_corrections_doc_biz_field_ts',
+        'field_corrections',
+        ['document_id', 'business_id', 'field_name', sa.text('timestamp DESC')],
+        unique=False
+    )
+    op.drop_index('ix_field_corrections_document_field_timestamp', table_name='field_corrections')
+
+
+def downgrade() -> None:
+    op.create_index(
+        'ix_field_corrections_document_field_timestamp',
+        'field_corrections',
+        ['document_id', 'field_name', sa.text('timestamp DESC')],
+        unique=False
+    )
+    op.drop_index('ix_field_corrections_doc_biz_field_ts', table_name='field_corrections')
@@ -0,0 +1,43 @@
+"""replace client/project name constraints with covering unique indexes
+
+Revision ID: f1a6c9d3b827
+Revises: d8b3f1c6e592
+Create Date: 2026-10-17 19:26:47.860153
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'f1a6c9d3b827'
+down_revision = 'd8b3f1c6e592'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Still unique on (business_id, name) for ON CONFLICT; INCLUDE lets the
+    # per-business name-ordered listings run as index-only scans
+    op.create_index(
+        'ix_clients_business_id_name',
+        'clients',
+        ['business_id', 'name'],
+        unique=True,
+        postgresql_include=['id', 'created_at']
+    )
+    op.drop_constraint('uq_clients_business_id_name', 'clients', type_='unique')
+    op.create_index(
+        'ix_projects_business_id_name',
+        'projects',
+        ['business_id', 'name'],
+        unique=True,
+        postgresql_include=['id', 'created_at']
+    )
+    op.drop_constraint('uq_projects_business_id_name', 'projects', type_='unique')
+
+
+def downgrade() -> None:
+    op.create_unique_constraint('uq_projects_business_id_name', 'projects', ['business_id', 'name'])
+    op.drop_index('ix_projects_business_id_name', table_name='projects')
+    op.create_unique_constraint('uq_clients_business_id_name', 'clients', ['business_id', 'name'])
+    op.drop_index('ix_clients_business_id_name', table_name='clients')
@@ -0,0 +1,37 @@
+"""add extracted_fields and line_items (document_id, business_id, ...) indexes
+
+Revision ID: f4b8d2a6c913
+Revises: e3a9c7b5d148
+Create Date: 2026-10-17 16:44:12.093576
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'f4b8d2a6c913'
+down_revision = 'e3a9c7b5d148'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Match the document-scoped filters and their ORDER BY so per-document
+    # reads scan one index range instead of sorting
+    op.create_index(
+        'ix_extracted_fields_doc_biz_name',
+        'extracted_fields',
+        ['document_id', 'business_id', 'field_name'],
+        unique=False
+    )
+    op.create_index(
+        'ix_line_items_doc_biz_id',
+        'line_items',
+        ['document_id', 'business_id', 'id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_line_items_doc_biz_id', table_name='line_items')
+    op.drop_index('ix_extracted_fields_doc_biz_name', table_name='extracted_fields')
@@ -0,0 +1,62 @@
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import IO, Optional
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener: Optional[QueueListener] = None
+
+
+class DeferredFormatQueueHandler(QueueHandler):
+    """
+    QueueHandler that enqueues the record unformatted.
+
+    The stock prepare() merges msg with args and renders any traceback in the
+    calling thread before enqueueing. The queue here never leaves the process,
+    so the record is passed through as-is and the listener's handler formats
+    it. Log call arguments must therefore not be mutated after the call.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def configure_queue_logging(
+    level: int = logging.INFO,
+    fmt: str = LOG_FORMAT,
+    stream: Optional[IO[str]] = None,
+) -> QueueListener:
+    """
+    Route root logging through a QueueHandler drained by a background listener.
+
+    Request threads only enqueue the record; formatting and the blocking
+    stream write happen on the listener thread. Calling this again returns
+    the listener that is already running.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    stream_handler = logging.StreamHandler(stream)
+    stream_handler.setFormatter(logging.Formatter(fmt))
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(DeferredFormatQueueHandler(log_queue))
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    # Flush anything still queued when the process exits
+    atexit.register(stop_queue_logging)
+    return _listener
+
+
+def stop_queue_logging() -> None:
+    """Drain the queue and stop the listener thread, if one is running"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -19,6 +19,10 @@ class Settings(BaseSettings):
     azure_storage_account_key: Optional[str] = None
     azure_storage_connection_string: Optional[str] = None
     azure_blob_container_name: str = "documents"
+    # Concurrent blob uploads per upload worker process (threaded pools)
+    max_inflight_uploads: int = 8
+    # Shared with the Celery workers, which pick uploads up from here
+    upload_spool_dir: str = "/var/app/data/uploads"
     
     # Redis/Celery settings
     redis_url: str = "redis://localhost:6379/0"
@@ -36,6 +40,9 @@ class Settings(BaseSettings):
     # Application settings
     debug: bool = False
     environment: str = "development"
+    # Worker threads for sync (def) endpoints; keep in step with the DB pool
+    # (DB_POOL_SIZE + DB_MAX_OVERFLOW) so extra threads don't just wait on connections
+    threadpool_size: int = 40
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,139 @@
+import json
+import logging
+from typing import Iterable
+
+from fastapi import HTTPException, status
+from starlette.formparsers import MultiPartParser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# File size limit: 10MB
+MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB in bytes
+MAX_FILES_PER_UPLOAD = 10
+
+# Headroom for multipart boundaries and per-part headers on top of the raw file bytes
+MULTIPART_OVERHEAD = 64 * 1024
+
+MAX_UPLOAD_REQUEST_SIZE = MAX_FILE_SIZE * MAX_FILES_PER_UPLOAD + MULTIPART_OVERHEAD
+
+
+def configure_multipart_spooling(max_in_memory_size: int = MAX_FILE_SIZE) -> None:
+    """
+    Keep every permitted upload in memory while Starlette parses the form.
+
+    Starlette spools each multipart file into a SpooledTemporaryFile that rolls
+    over to disk past MultiPartParser.max_file_size (1MB by default), so any
+    upload between 1MB and MAX_FILE_SIZE would otherwise always touch disk.
+    """
+    MultiPartParser.max_file_size = max_in_memory_size
+
+
+def _too_large_detail() -> str:
+    limit_mb = MAX_FILE_SIZE / (1024 * 1024)
+    return (
+        f"Request body too large. Maximum {MAX_FILES_PER_UPLOAD} files "
+        f"of {limit_mb:.1f}MB each per request."
+    )
+
+
+class _BodyTooLarge(HTTPException):
+    """
+    Raised from the wrapped receive channel when the streamed body exceeds the cap.
+
+    It is an HTTPException because FastAPI re-raises those from request.form()
+    (any other error becomes a 400 "error parsing the body"), so a chunked
+    upload to a File(...) route is answered with 413 by the exception handler.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=_too_large_detail(),
+            headers={"Connection": "close"},
+        )
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject oversize upload requests with 413 before the multipart body is parsed.
+
+    FastAPI resolves File(...) parameters (which spools the whole body to disk)
+    before any dependency or handler code runs, so the check has to live at the
+    ASGI layer. Requests that declare a Content-Length above the cap are refused
+    without reading a single body byte; chunked requests are counted as they
+    stream and aborted as soon as they cross the cap.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_body_size: int = MAX_UPLOAD_REQUEST_SIZE,
+        paths: Iterable[str] = ("/documents/upload",),
+    ):
+        self.app = app
+        self.max_body_size = max_body_size
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].rstrip("/") not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = self._get_content_length(scope)
+        if content_length is not None and content_length > self.max_body_size:
+            logger.info(
+                "Rejected upload of %d bytes to %s (limit %d bytes)",
+                content_length, scope["path"], self.max_body_size
+            )
+            await self._send_413(send)
+            return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    raise _BodyTooLarge()
+            return message
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except _BodyTooLarge:
+            # Only reached when no exception handler turned it into a response
+            if response_started:
+                raise
+            await self._send_413(send)
+
+    @staticmethod
+    def _get_content_length(scope: Scope):
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                try:
+                    return int(value)
+                except ValueError:
+                    return None
+        return None
+
+    async def _send_413(self, send: Send) -> None:
+        body = json.dumps({"detail": _too_large_detail()}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -2,12 +2,11 @@ import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .routers import auth, documents, tags, analysis, clients
+from .core.log_queue import configure_queue_logging
+from .core.uploads import UploadSizeLimitMiddleware, configure_multipart_spooling
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging; records are written to stderr from a background listener thread
+configure_queue_logging(level=logging.INFO)
 
 app = FastAPI(
     title="LexiTau API",
@@ -23,6 +22,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Hold uploads up to MAX_FILE_SIZE in memory instead of rolling over to disk at 1MB
+configure_multipart_spooling()
+
+# Refuse oversize uploads from Content-Length before the multipart body is spooled
+app.add_middleware(UploadSizeLimitMiddleware)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(documents.router)
@@ -33,6 +38,13 @@ app.include_router(analysis.router)
 # Warm the value index at startup
 from .db import get_db
 from .routers.analysis import get_value_index
+from .core.settings import get_settings
+from anyio import to_thread
+
+@app.on_event("startup")
+async def size_threadpool():
+    # sync endpoints and dependencies run on anyio's default limiter
+    to_thread.current_default_thread_limiter().total_tokens = get_settings().threadpool_size
 
 @app.on_event("startup")
 def warm_indexes():
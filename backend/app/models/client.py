@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..db import Base
@@ -16,4 +16,16 @@ class Client(Base):
     name = Column(String, nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    __table_args__ = (
+        # Names are unique per business (creation relies on it for ON CONFLICT DO NOTHING);
+        # the included columns let the name-ordered list be an index-only scan
+        Index(
+            'ix_clients_business_id_name',
+            'business_id',
+            'name',
+            unique=True,
+            postgresql_include=['id', 'created_at']
+        ),
+    )
+    
     business = relationship("Business")
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Enum, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -23,11 +23,40 @@ class Document(Base):
     classification = Column(Enum(DocumentClassification), nullable=False, index=True)
     status = Column(Enum(DocumentStatus), nullable=False, default=DocumentStatus.PENDING)
     confidence_score = Column(Float, nullable=True)
+    # Denormalized count of field_corrections rows, so reads can skip the
+    # corrections lookup for the (common) never-corrected document
+    corrections_count = Column(Integer, nullable=False, default=0, server_default="0")
     reviewed_at = Column(DateTime(timezone=True), nullable=True)
     reviewed_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    __table_args__ = (
+        # Serves newest-first listing and keyset pagination as an ordered index scan
+        Index('ix_documents_business_created_at_id', 'business_id', created_at.desc(), id.desc()),
+        # Answers the per-request (id, business_id) access and status check from the index alone
+        Index(
+            'ix_documents_business_id_id', 'business_id', 'id',
+            postgresql_include=['status', 'reviewed_at', 'reviewed_by']
+        ),
+        # Newest-first listing of the dashboard's processing and review queues.
+        # Uploads are registered straight into PROCESSING, so that is the
+        # in-flight status worth indexing.
+        Index(
+            'ix_docs_business_processing', 'business_id', created_at.desc(),
+            postgresql_where=text("status = 'PROCESSING'")
+        ),
+        Index(
+            'ix_docs_business_completed', 'business_id', created_at.desc(),
+            postgresql_where=text("status = 'COMPLETED'")
+        ),
+        # Reviewed / not-yet-reviewed filtering within a business
+        Index('ix_docs_business_reviewed', 'business_id', 'reviewed_at'),
+    )
+    
+    # Fetch server-generated timestamps via RETURNING on flush instead of a refresh
+    __mapper_args__ = {"eager_defaults": True}
+    
     user = relationship("User", back_populates="documents", foreign_keys=[user_id])
     reviewer = relationship("User", foreign_keys=[reviewed_by], post_update=True)
     business = relationship("Business")
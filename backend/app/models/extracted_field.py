@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, Float, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -22,4 +22,10 @@ class ExtractedField(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    __table_args__ = (
+        # Serves a document's fields in field_name order, and single-field lookups by prefix;
+        # unique so field corrections can upsert on it
+        Index('ix_extracted_fields_doc_biz_name', 'document_id', 'business_id', 'field_name', unique=True),
+    )
+    
     document = relationship("Document", back_populates="extracted_fields")
\ No newline at end of file
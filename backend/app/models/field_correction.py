@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -23,6 +23,11 @@ class FieldCorrection(Base):
     corrected_by = Column(Integer, ForeignKey("users.id"), nullable=False)  # User who made the correction
     timestamp = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # When correction was made
     
+    __table_args__ = (
+        # Serves the latest-correction-per-field lookup as an ordered index scan
+        Index('ix_field_corrections_doc_biz_field_ts', 'document_id', 'business_id', 'field_name', timestamp.desc()),
+    )
+    
     # Relationships
     document = relationship("Document", back_populates="field_corrections")
     corrected_by_user = relationship("User", back_populates="field_corrections")
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, Text, Float, ForeignKey, Numeric
+from sqlalchemy import Column, Integer, DateTime, Text, Float, ForeignKey, Numeric, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -16,11 +16,21 @@ class LineItem(Base):
     document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id"), nullable=False, index=True)
     business_id = Column(Integer, ForeignKey("businesses.id"), nullable=False, index=True)
     description = Column(Text, nullable=True)  # Product/service description
-    quantity = Column(Numeric(10, 3), nullable=True)  # Quantity (supports decimals like 1.5 hours)
-    unit_price = Column(Numeric(10, 2), nullable=True)  # Price per unit in currency
-    total = Column(Numeric(10, 2), nullable=True)  # Total amount for this line item
+    # Stored as exact NUMERIC but loaded as float, which is all the API and the
+    # summaries use; skips building a Decimal per value on every read
+    quantity = Column(Numeric(10, 3, asdecimal=False), nullable=True)  # Quantity (supports decimals like 1.5 hours)
+    unit_price = Column(Numeric(10, 2, asdecimal=False), nullable=True)  # Price per unit in currency
+    total = Column(Numeric(10, 2, asdecimal=False), nullable=True)  # Total amount for this line item
     confidence = Column(Float, nullable=True)  # Confidence score (0.0 to 1.0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    __table_args__ = (
+        # Serves a document's line items in id order without a sort
+        Index('ix_line_items_doc_biz_id', 'document_id', 'business_id', 'id'),
+    )
+    
+    # Fetch server-generated timestamps via RETURNING on flush instead of a refresh
+    __mapper_args__ = {"eager_defaults": True}
+    
     document = relationship("Document", back_populates="line_items")
\ No newline at end of file
@@ -47,9 +47,13 @@ def _is_safe_select(sql: str) -> bool:
 def execute_readonly_sql(db: Session, sql: str, params: dict = None) -> List[Tuple]:
     """Safely execute SQL in read-only mode and return results."""
     try:
-        # Set safety constraints: timeout and read-only mode
-        db.execute(text("SET LOCAL statement_timeout = 5000"))  # 5 seconds
-        db.execute(text("SET LOCAL default_transaction_read_only = on"))
+        # Set safety constraints: timeout (5 seconds) and read-only mode. Both are
+        # transaction-local settings applied in one round trip, and the query text
+        # below stays unchanged so the server can reuse its plan.
+        db.execute(text(
+            "SELECT set_config('statement_timeout', '5000', true), "
+            "set_config('default_transaction_read_only', 'on', true)"
+        ))
 
         # Execute the query
         result = db.execute(text(sql), params or {})
@@ -173,8 +177,9 @@ async def run_pipeline(
     if not isinstance(business_id, int) or business_id <= 0:
         raise HTTPException(status_code=403, detail="Missing or invalid tenant (business_id)")
 
-    # Warm/reuse the value index (LSH over per-column MinHashes)
-    vindex = get_value_index(db)
+    # Warm/reuse the value index (LSH over per-column MinHashes); a cold build
+    # reads column_profiles, so it runs off the event loop
+    vindex = await anyio.to_thread.run_sync(get_value_index, db)
 
     # Plug in your OpenAI client
     try:
@@ -217,8 +222,11 @@ async def run_pipeline(
         if not _is_safe_select(sql_exec):
             raise HTTPException(status_code=400, detail="Only SELECT queries allowed")
 
-        # Execute SQL safely
-        raw_results = execute_readonly_sql(db, sql_exec, {"business_id": business_id})
+        # Execute SQL safely; the query can run for up to the statement timeout,
+        # so it runs in a worker thread instead of blocking the event loop
+        raw_results = await anyio.to_thread.run_sync(
+            execute_readonly_sql, db, sql_exec, {"business_id": business_id}
+        )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"SQL execution failed: {e}")
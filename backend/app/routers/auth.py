@@ -14,7 +14,7 @@ from ..services.auth_service import AuthService
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 @router.post("/signup", response_model=SignupResponse)
-async def signup(
+def signup(
     request: SignupRequest,
     db: Session = Depends(get_db)
 ):
@@ -22,7 +22,7 @@ async def signup(
     return AuthService.signup_user(db, request)
 
 @router.post("/login", response_model=LoginResponse)
-async def login(
+def login(
     request: LoginRequest,
     db: Session = Depends(get_db)
 ):
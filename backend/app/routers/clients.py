@@ -1,7 +1,10 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from .. import models, schemas
+from ..db import upsert_insert
 from ..dependencies import get_db, get_current_user
 
 router = APIRouter(
@@ -18,29 +21,27 @@ def create_client(
     current_user: models.User = Depends(get_current_user)
 ):
     """Create a new client for the current user's business"""
-    # Check if client with the same name already exists for this business
-    existing_client = db.query(models.Client).filter(
-        models.Client.business_id == current_user.business_id,
-        models.Client.name == client.name
+    # Create new client; a name already used by this business hits the unique
+    # constraint and returns no row, so there is no separate existence check
+    db_client = db.scalars(
+        upsert_insert(db, models.Client)
+        .values(name=client.name, business_id=current_user.business_id)
+        .on_conflict_do_nothing(index_elements=[models.Client.business_id, models.Client.name])
+        .returning(models.Client)
     ).first()
 
-    if existing_client:
+    if db_client is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Client with this name already exists for your business"
         )
 
-    # Create new client
-    db_client = models.Client(
-        name=client.name,
-        business_id=current_user.business_id
-    )
-
-    db.add(db_client)
+    # Serialize from the RETURNING row before commit expires it, which would
+    # otherwise cost a SELECT when the response is rendered
+    response = schemas.Client.model_validate(db_client)
     db.commit()
-    db.refresh(db_client)
 
-    return db_client
+    return response
 
 
 @router.get("", response_model=List[schemas.Client])
@@ -50,8 +51,12 @@ def list_clients(
 ):
     """List all clients for the current user's business"""
     # Query clients scoped to the user's business
-    clients = db.query(models.Client).filter(
-        models.Client.business_id == current_user.business_id
-    ).order_by(models.Client.name).all()
-
-    return clients
\ No newline at end of file
+    clients = db.execute(
+        select(models.Client.id, models.Client.name, models.Client.business_id, models.Client.created_at)
+        .where(models.Client.business_id == current_user.business_id)
+        .order_by(models.Client.name)
+    ).mappings().all()
+
+    # Returned as a response so FastAPI skips re-validating every row against
+    # response_model, which still documents the route
+    return ORJSONResponse([dict(client) for client in clients])
\ No newline at end of file
@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, File, Query
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import func, insert, lambda_stmt, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 import logging
-import math
 
+from ..db import upsert_insert
 from ..dependencies import get_db, get_current_user
 from .. import models
 from ..schemas import (
@@ -24,35 +28,51 @@ from ..schemas import (
     LineItemUpdateResponse,
     MarkReviewedRequest,
     MarkReviewedResponse,
+    BulkMarkReviewedRequest,
+    BulkMarkReviewedResponse,
     DocumentTagRequest,
-    DocumentTagResponse
+    DocumentTagResponse,
+    UploadTaskStatusResponse
+)
+from ..schemas.document import (
+    HIGH_CONFIDENCE_THRESHOLD,
+    LOW_CONFIDENCE_THRESHOLD,
+    MEDIUM_CONFIDENCE_THRESHOLD
 )
 from ..enums import FileType, DocumentType, DocumentStatus, DocumentClassification
 from ..services.document_service import (
     DocumentProcessingService, 
     DocumentQueryService,
-    DocumentManagementService
+    DocumentManagementService,
+    EXTRACTED_FIELD_RESPONSE_COLUMNS,
+    invalidate_document_list_cache
 )
+from ..core.uploads import MAX_FILES_PER_UPLOAD
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
+# Validates a document's line items in one pydantic-core call rather than one
+# model_validate per item
+_line_item_list_adapter = TypeAdapter(List[LineItemResponse])
+
 
 
-@router.post("/upload", response_model=DocumentUploadResponse)
+@router.post("/upload", response_model=DocumentUploadResponse, status_code=status.HTTP_202_ACCEPTED)
 async def upload_documents(
     files: List[UploadFile] = File(...),
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: models.User = Depends(get_current_user)
 ):
     """
     Upload multiple documents with the following validations:
     - File size must be ≤ 10MB
     - File type must be PDF, JPG, or PNG
-    - Files are uploaded to Azure Blob Storage
-    - models.Document records are created with PENDING status
-    - OCR processing tasks are dispatched (TODO)
+    
+    Accepted files are spooled and handed to the upload workers, which upload
+    them to Azure Blob Storage, create models.Document records with PROCESSING
+    status and dispatch OCR. Responds 202 with a document_id and task_id per
+    file; poll /documents/uploads/{task_id} for the upload outcome.
     
     Returns upload status for each file.
     """
@@ -62,17 +82,14 @@ async def upload_documents(
             detail="No files provided"
         )
     
-    if len(files) > 10:  # Limit to 10 files per request
+    if len(files) > MAX_FILES_PER_UPLOAD:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Too many files. Maximum 10 files per request."
+            detail=f"Too many files. Maximum {MAX_FILES_PER_UPLOAD} files per request."
         )
     
-    # Process each file
-    results = []
-    for file in files:
-        result = await DocumentProcessingService.process_single_file(file, current_user, db)
-        results.append(result)
+    # Validate and queue all files concurrently
+    results = await DocumentProcessingService.process_files(files, current_user)
     
     # Calculate summary statistics
     successful_uploads = sum(1 for r in results if r.success)
@@ -86,8 +103,22 @@ async def upload_documents(
     )
 
 
+@router.get("/uploads/{task_id}", response_model=UploadTaskStatusResponse)
+def get_upload_status(
+    task_id: str,
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    Get the state of a queued upload.
+    
+    Once the task succeeds the response carries the registered document_id;
+    the document's OCR progress is then available from its fields endpoint.
+    """
+    return DocumentProcessingService.get_upload_status(task_id, current_user.business_id)
+
+
 @router.get("/", response_model=DocumentListResponse)
-async def list_business_documents(
+def list_business_documents(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
     status: Optional[DocumentStatus] = Query(None, description="Filter by document status"),
@@ -97,6 +128,8 @@ async def list_business_documents(
     client_id: Optional[int] = Query(None, description="Filter by client ID"),
     project_id: Optional[int] = Query(None, description="Filter by project ID"),  
     category_id: Optional[int] = Query(None, description="Filter by category ID"),
+    cursor: Optional[str] = Query(None, description="next_cursor from a previous page; takes precedence over page"),
+    include_total: bool = Query(False, description="Include total counts when paging by cursor"),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -115,6 +148,10 @@ async def list_business_documents(
     Tag filters (client_id, project_id, category_id) validate ownership to ensure
     users can only filter by tags that belong to their business.
     
+    Pagination is by page number, or by keyset when the next_cursor of a
+    previous response is passed back as cursor. Cursor pages skip the total
+    count unless include_total is set.
+    
     Returns paginated results with metadata.
     """
     return DocumentQueryService.list_business_documents(
@@ -128,7 +165,9 @@ async def list_business_documents(
         is_reviewed=is_reviewed,
         client_id=client_id,
         project_id=project_id,
-        category_id=category_id
+        category_id=category_id,
+        cursor=cursor,
+        include_total=include_total
     )
 
 
@@ -145,18 +184,40 @@ def calculate_fields_summary(fields: List[models.ExtractedField]) -> Dict[str, A
             "low_confidence_fields": 0
         }
     
-    total_fields = len(fields)
-    fields_with_values = len([f for f in fields if f.value is not None and f.value.strip() != ""])
-    
-    confidences = [f.confidence for f in fields if f.confidence is not None and f.value is not None and f.value.strip() != ""]
-    average_confidence = sum(confidences) / len(confidences) if confidences else 0.0
-    
-    high_confidence = len([c for c in confidences if c >= 0.8])
-    medium_confidence = len([c for c in confidences if 0.5 <= c < 0.8])
-    low_confidence = len([c for c in confidences if c < 0.5])
+    # Single pass over the fields accumulating every counter
+    total_fields = 0
+    fields_with_values = 0
+    confidence_sum = 0.0
+    confidence_count = 0
+    high_confidence = 0
+    medium_confidence = 0
+    low_confidence = 0
+    flagged_low_confidence = 0  # Fields flagged as low confidence (< 0.7 or None)
+    
+    for f in fields:
+        total_fields += 1
+        value = f.value
+        has_value = value is not None and value.strip() != ""
+        if has_value:
+            fields_with_values += 1
+        
+        confidence = f.confidence
+        if confidence is None:
+            flagged_low_confidence += 1
+            continue
+        if confidence < LOW_CONFIDENCE_THRESHOLD:
+            flagged_low_confidence += 1
+        if has_value:
+            confidence_sum += confidence
+            confidence_count += 1
+            if confidence >= HIGH_CONFIDENCE_THRESHOLD:
+                high_confidence += 1
+            elif confidence >= MEDIUM_CONFIDENCE_THRESHOLD:
+                medium_confidence += 1
+            else:
+                low_confidence += 1
     
-    # Count fields that are flagged as low confidence (< 0.7 or None)
-    flagged_low_confidence = len([f for f in fields if is_low_confidence(f.confidence)])
+    average_confidence = confidence_sum / confidence_count if confidence_count else 0.0
     
     return {
         "total_fields": total_fields,
@@ -180,9 +241,57 @@ def is_low_confidence(confidence: Optional[float]) -> bool:
     Returns:
         True if confidence < 0.7 or confidence is None
     """
-    if confidence is None:
-        return True
-    return confidence < 0.7
+    return confidence is None or confidence < LOW_CONFIDENCE_THRESHOLD
+
+
+def query_latest_corrections(
+    db: Session,
+    document_id: UUID,
+    business_id: int
+) -> List[models.FieldCorrection]:
+    """
+    Fetch only the most recent correction per field for a document.
+    
+    Uses DISTINCT ON on PostgreSQL, which walks the
+    (document_id, business_id, field_name, timestamp DESC) index; other
+    dialects fall back to a ROW_NUMBER() window.
+    """
+    # Only the columns the overlay reads are loaded, skipping original_value and
+    # the audit columns. The PostgreSQL form is a lambda statement so SQLAlchemy
+    # caches the construct by the lambda's code location instead of rebuilding
+    # it per call; document_id and business_id are extracted as bound parameters.
+    if db.get_bind().dialect.name == "postgresql":
+        stmt = lambda_stmt(
+            lambda: select(models.FieldCorrection)
+            .options(load_only(
+                models.FieldCorrection.field_name,
+                models.FieldCorrection.corrected_value,
+                models.FieldCorrection.timestamp
+            ))
+            .where(
+                models.FieldCorrection.document_id == document_id,
+                models.FieldCorrection.business_id == business_id
+            )
+            .order_by(models.FieldCorrection.field_name, models.FieldCorrection.timestamp.desc())
+            .distinct(models.FieldCorrection.field_name)
+        )
+        return db.execute(stmt).scalars().all()
+    
+    correction = models.FieldCorrection
+    ranked = select(
+        correction.id,
+        func.row_number().over(
+            partition_by=correction.field_name,
+            order_by=correction.timestamp.desc()
+        ).label("rank")
+    ).where(
+        correction.document_id == document_id,
+        correction.business_id == business_id
+    ).subquery()
+    
+    return db.query(correction).options(
+        load_only(correction.field_name, correction.corrected_value, correction.timestamp)
+    ).join(ranked, correction.id == ranked.c.id).filter(ranked.c.rank == 1).all()
 
 
 def build_field_responses_with_corrections(
@@ -202,21 +311,31 @@ def build_field_responses_with_corrections(
     Returns:
         List of ExtractedFieldResponse with corrected values applied
     """
-    # Get the latest corrections for each field (if any)
-    latest_corrections = {}
-    corrections = db.query(models.FieldCorrection).filter(
-        models.FieldCorrection.document_id == document_id,
-        models.FieldCorrection.business_id == business_id
-    ).order_by(models.FieldCorrection.field_name, models.FieldCorrection.timestamp.desc()).all()
-    
-    # Build a map of latest correction per field
-    for correction in corrections:
-        if correction.field_name not in latest_corrections:
-            latest_corrections[correction.field_name] = correction
+    # Get the latest correction for each field (if any), deduplicated in SQL
+    corrections = query_latest_corrections(db, document_id, business_id)
+    latest_corrections = {correction.field_name: correction for correction in corrections}
+    
+    return build_field_responses_from_maps(extracted_fields, latest_corrections)
+
+
+def build_field_responses_from_maps(
+    extracted_fields: List[models.ExtractedField],
+    latest_corrections: Dict[str, models.FieldCorrection]
+) -> List[ExtractedFieldResponse]:
+    """
+    Build field responses from fields and their latest corrections without querying.
     
+    Args:
+        extracted_fields: List of models.ExtractedField objects
+        latest_corrections: Latest models.FieldCorrection keyed by field name
+        
+    Returns:
+        List of ExtractedFieldResponse with corrected values applied
+    """
     # Convert to response format with corrected values overlay
     field_responses = []
     for field in extracted_fields:
+        confidence = field.confidence
         correction = latest_corrections.get(field.field_name)
         has_correction = correction is not None
         
@@ -229,33 +348,40 @@ def build_field_responses_with_corrections(
             value=display_value,  # This shows corrected value if available, otherwise original
             original_value=field.value,  # Always show the original OCR value
             corrected_value=correction.corrected_value if has_correction else None,
-            confidence=field.confidence,
-            is_low_confidence=is_low_confidence(field.confidence),
+            confidence=confidence,
+            is_low_confidence=confidence is None or confidence < LOW_CONFIDENCE_THRESHOLD,
             is_corrected=has_correction,
             created_at=field.created_at,
             updated_at=field.updated_at
         ))
     
-    # Handle fields that exist only as corrections (user-added fields)
-    for field_name, correction in latest_corrections.items():
-        # Check if this correction is for a field that doesn't exist in models.ExtractedField
-        existing_field = any(f.field_name == field_name for f in extracted_fields)
-        if not existing_field:
-            # This is a user-added field that didn't exist in OCR extraction
-            field_responses.append(ExtractedFieldResponse(
-                id=0,  # No original field ID
-                field_name=field_name,
-                value=correction.corrected_value,
-                original_value=None,  # No original value since this was user-added
-                corrected_value=correction.corrected_value,
-                confidence=None,  # User-added fields have no confidence
-                is_low_confidence=False,
-                is_corrected=True,
-                created_at=correction.timestamp,
-                updated_at=correction.timestamp
-            ))
+    # Handle fields that exist only as corrections (user-added fields), which
+    # didn't exist in OCR extraction
+    existing_names = {field.field_name for field in extracted_fields}
+    added_names = sorted(name for name in latest_corrections if name not in existing_names)
+    if not added_names:
+        return field_responses
+    
+    added_responses = [
+        ExtractedFieldResponse(
+            id=0,  # No original field ID
+            field_name=field_name,
+            value=correction.corrected_value,
+            original_value=None,  # No original value since this was user-added
+            corrected_value=correction.corrected_value,
+            confidence=None,  # User-added fields have no confidence
+            is_low_confidence=False,
+            is_corrected=True,
+            created_at=correction.timestamp,
+            updated_at=correction.timestamp
+        )
+        for field_name, correction in zip(added_names, map(latest_corrections.get, added_names))
+    ]
     
-    # Sort field responses by field_name for consistent ordering
+    # Sort by field_name in Python rather than trusting the SQL order, which
+    # follows the database collation. Both runs are usually already ordered,
+    # so timsort merges them in close to one linear pass.
+    field_responses.extend(added_responses)
     field_responses.sort(key=lambda x: x.field_name)
     return field_responses
 
@@ -271,17 +397,34 @@ def calculate_line_items_summary(line_items: List[models.LineItem]) -> Dict[str,
             "total_amount": 0.0
         }
     
-    total_line_items = len(line_items)
-    items_with_descriptions = len([item for item in line_items if item.description is not None and item.description.strip() != ""])
-    items_with_totals = len([item for item in line_items if item.total is not None])
-    
-    confidences = [item.confidence for item in line_items if item.confidence is not None]
-    average_confidence = sum(confidences) / len(confidences) if confidences else 0.0
-    
-    total_amount = sum([float(item.total) for item in line_items if item.total is not None])
+    # Single pass over the line items accumulating every counter
+    total_line_items = 0
+    items_with_descriptions = 0
+    items_with_totals = 0
+    confidence_sum = 0.0
+    confidence_count = 0
+    total_amount = 0.0
+    flagged_low_confidence = 0  # Line items flagged as low confidence (< 0.7 or None)
+    
+    for item in line_items:
+        total_line_items += 1
+        description = item.description
+        if description is not None and description.strip() != "":
+            items_with_descriptions += 1
+        if item.total is not None:
+            items_with_totals += 1
+            total_amount += item.total
+        
+        confidence = item.confidence
+        if confidence is None:
+            flagged_low_confidence += 1
+            continue
+        if confidence < LOW_CONFIDENCE_THRESHOLD:
+            flagged_low_confidence += 1
+        confidence_sum += confidence
+        confidence_count += 1
     
-    # Count line items that are flagged as low confidence (< 0.7 or None)
-    flagged_low_confidence = len([item for item in line_items if is_low_confidence(item.confidence)])
+    average_confidence = confidence_sum / confidence_count if confidence_count else 0.0
     
     return {
         "total_line_items": total_line_items,
@@ -294,7 +437,7 @@ def calculate_line_items_summary(line_items: List[models.LineItem]) -> Dict[str,
 
 
 @router.get("/{document_id}/fields", response_model=DocumentFieldsResponse)
-async def get_document_fields(
+def get_document_fields(
     document_id: UUID,
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -313,11 +456,8 @@ async def get_document_fields(
     - COMPLETED: Returns full extraction results
     - FAILED: Returns error status with empty results
     """
-    # Get the document and verify ownership
-    document = db.query(models.Document).filter(
-        models.Document.id == document_id,
-        models.Document.business_id == current_user.business_id
-    ).first()
+    # Get the document with its fields and line items, verifying ownership
+    document = DocumentQueryService.get_business_document_with_details(db, document_id, current_user.business_id)
     
     if not document:
         raise HTTPException(
@@ -325,59 +465,29 @@ async def get_document_fields(
             detail="models.Document not found or access denied"
         )
     
-    # Get extracted fields for this document
-    extracted_fields = db.query(models.ExtractedField).filter(
-        models.ExtractedField.document_id == document_id,
-        models.ExtractedField.business_id == current_user.business_id
-    ).order_by(models.ExtractedField.field_name).all()
+    extracted_fields = document.extracted_fields
+    line_items = document.line_items
     
-    # Get line items for this document
-    line_items = db.query(models.LineItem).filter(
-        models.LineItem.document_id == document_id,
-        models.LineItem.business_id == current_user.business_id
-    ).order_by(models.LineItem.id).all()
-    
-    # Build field responses with corrections overlay
-    field_responses = build_field_responses_with_corrections(extracted_fields, document_id, current_user.business_id, db)
-    
-    line_item_responses = [
-        LineItemResponse(
-            id=item.id,
-            description=item.description,
-            quantity=float(item.quantity) if item.quantity else None,
-            unit_price=float(item.unit_price) if item.unit_price else None,
-            total=float(item.total) if item.total else None,
-            confidence=item.confidence,
-            is_low_confidence=is_low_confidence(item.confidence),
-            created_at=item.created_at,
-            updated_at=item.updated_at
-        )
-        for item in line_items
-    ]
+    # Build field responses with corrections overlay; uncorrected documents
+    # skip the corrections query altogether
+    if document.corrections_count:
+        field_responses = build_field_responses_with_corrections(extracted_fields, document_id, current_user.business_id, db)
+    else:
+        field_responses = build_field_responses_from_maps(extracted_fields, {})
+    
+    line_item_responses = _line_item_list_adapter.validate_python(line_items, from_attributes=True)
     
     # Create document info response
-    document_info = DocumentResponse(
-        id=document.id,
-        filename=document.filename,
-        file_type=document.file_type,
-        document_type=document.document_type,
-        status=document.status,
-        user_id=document.user_id,
-        business_id=document.business_id,
-        file_url=document.file_url,
-        confidence_score=document.confidence_score,
-        reviewed_at=document.reviewed_at,
-        reviewed_by=document.reviewed_by,
-        is_reviewed=document.reviewed_at is not None,
-        created_at=document.created_at,
-        updated_at=document.updated_at
-    )
+    document_info = DocumentResponse.model_validate(document)
     
     # Calculate summary statistics
     fields_summary = calculate_fields_summary(extracted_fields)
     line_items_summary = calculate_line_items_summary(line_items)
     
-    logger.info(f"Retrieved {len(extracted_fields)} fields and {len(line_items)} line items for document {document_id}")
+    logger.info(
+        "Retrieved %d fields and %d line items for document %s",
+        len(extracted_fields), len(line_items), document_id
+    )
     
     return DocumentFieldsResponse(
         document_id=document_id,
@@ -392,7 +502,7 @@ async def get_document_fields(
 
 
 @router.post("/{document_id}/fields/correct", response_model=FieldCorrectionsResponse)
-async def correct_document_fields(
+def correct_document_fields(
     document_id: UUID,
     corrections_request: FieldCorrectionsRequest,
     current_user: models.User = Depends(get_current_user),
@@ -417,11 +527,12 @@ async def correct_document_fields(
     
     Returns updated field list and correction results.
     """
-    # Validate user has access to document
-    document = db.query(models.Document).filter(
-        models.Document.id == document_id,
-        models.Document.business_id == current_user.business_id
-    ).first()
+    # Validate user has access to document; the row lock makes concurrent
+    # corrections to the same document apply one after the other, so neither
+    # chains from a stale value (the field upsert itself can't duplicate a row)
+    document = DocumentQueryService.get_business_document(
+        db, document_id, current_user.business_id, lock=True
+    )
     
     if not document:
         raise HTTPException(
@@ -440,97 +551,121 @@ async def correct_document_fields(
     corrections_applied = 0
     corrections_failed = 0
     
-    # Process each correction
-    for correction_req in corrections_request.corrections:
-        try:
-            # Get existing field if it exists
-            existing_field = db.query(models.ExtractedField).filter(
-                models.ExtractedField.document_id == document_id,
-                models.ExtractedField.business_id == current_user.business_id,
-                models.ExtractedField.field_name == correction_req.field_name
-            ).first()
-            
-            original_value = existing_field.value if existing_field else None
-            was_new_field = existing_field is None
-            
-            # Log the correction
-            field_correction = models.FieldCorrection(
-                document_id=document_id,
-                business_id=current_user.business_id,
-                field_name=correction_req.field_name,
-                original_value=original_value,
-                corrected_value=correction_req.corrected_value,
-                corrected_by=current_user.id
-            )
-            db.add(field_correction)
-            
-            # Update or create the extracted field
-            if existing_field:
-                existing_field.value = correction_req.corrected_value
-                existing_field.updated_at = func.now()
-                message = f"Field '{correction_req.field_name}' updated successfully"
-            else:
-                # Create new field for correction
-                new_field = models.ExtractedField(
-                    document_id=document_id,
-                    business_id=current_user.business_id,
-                    field_name=correction_req.field_name,
-                    value=correction_req.corrected_value,
-                    confidence=None  # User-corrected fields have no confidence score
-                )
-                db.add(new_field)
-                message = f"New field '{correction_req.field_name}' created successfully"
-            
-            # Record successful correction
-            correction_results.append(FieldCorrectionResult(
-                field_name=correction_req.field_name,
-                success=True,
-                message=message,
-                original_value=original_value,
-                corrected_value=correction_req.corrected_value,
-                was_new_field=was_new_field
-            ))
-            
-            corrections_applied += 1
-            
-        except Exception as e:
-            logger.error(f"Failed to process correction for field '{correction_req.field_name}': {str(e)}")
-            
-            # Record failed correction
-            correction_results.append(FieldCorrectionResult(
-                field_name=correction_req.field_name,
-                success=False,
-                message=f"Failed to correct field: {str(e)}",
-                original_value=None,
-                corrected_value=correction_req.corrected_value,
-                was_new_field=False
-            ))
-            
-            corrections_failed += 1
-    
-    # Commit all changes if any corrections were successful
-    if corrections_applied > 0:
-        try:
-            db.commit()
-            logger.info(f"Applied {corrections_applied} corrections to document {document_id}")
-        except Exception as e:
-            db.rollback()
-            logger.error(f"Failed to commit corrections for document {document_id}: {str(e)}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to save corrections to database"
-            )
-    
-    # Get updated fields after corrections
-    updated_fields = db.query(models.ExtractedField).filter(
+    # Load every field and the latest prior corrections up front; the response
+    # is then built from this state plus RETURNING data, with no re-query
+    all_fields = db.query(models.ExtractedField).options(
+        load_only(*EXTRACTED_FIELD_RESPONSE_COLUMNS)
+    ).filter(
         models.ExtractedField.document_id == document_id,
         models.ExtractedField.business_id == current_user.business_id
     ).order_by(models.ExtractedField.field_name).all()
-
-    # Build field responses with corrections overlay
-    field_responses = build_field_responses_with_corrections(updated_fields, document_id, current_user.business_id, db)
+    latest_corrections = {
+        correction.field_name: correction
+        for correction in query_latest_corrections(db, document_id, current_user.business_id)
+    } if document.corrections_count else {}
+    
+    existing_fields = {field.field_name for field in all_fields}
+    
+    # Current value per field name as corrections are applied in request order,
+    # so repeated corrections to one field chain their original values
+    current_values = {field.field_name: field.value for field in all_fields}
+    correction_rows = []
+    # Final value per field name; repeated corrections collapse so the upsert
+    # touches each row once
+    field_values = {}
     
-    logger.info(f"Field corrections completed for document {document_id}: {corrections_applied} applied, {corrections_failed} failed")
+    for correction_req in corrections_request.corrections:
+        field_name = correction_req.field_name
+        was_new_field = field_name not in current_values
+        original_value = None if was_new_field else current_values[field_name]
+        
+        # Log the correction
+        correction_rows.append({
+            "document_id": document_id,
+            "business_id": current_user.business_id,
+            "field_name": field_name,
+            "original_value": original_value,
+            "corrected_value": correction_req.corrected_value,
+            "corrected_by": current_user.id
+        })
+        
+        # Update or create the extracted field
+        field_values[field_name] = correction_req.corrected_value
+        if was_new_field:
+            message = f"New field '{field_name}' created successfully"
+        else:
+            message = f"Field '{field_name}' updated successfully"
+        current_values[field_name] = correction_req.corrected_value
+        
+        correction_results.append(FieldCorrectionResult(
+            field_name=field_name,
+            success=True,
+            message=message,
+            original_value=original_value,
+            corrected_value=correction_req.corrected_value,
+            was_new_field=was_new_field
+        ))
+        corrections_applied += 1
+    
+    # Write everything with one statement per table and a single commit. RETURNING
+    # hands back server-generated ids and timestamps so the response needs no reload.
+    try:
+        new_corrections = db.scalars(
+            insert(models.FieldCorrection).returning(models.FieldCorrection, sort_by_parameter_order=True),
+            correction_rows
+        ).all()
+        # Later corrections in the request supersede earlier ones
+        for correction in new_corrections:
+            latest_corrections[correction.field_name] = correction
+        
+        # One upsert creates missing fields and overwrites existing ones. Existing
+        # rows keep their OCR confidence; populate_existing refreshes the loaded
+        # objects from RETURNING so the response sees the stored values.
+        upsert = upsert_insert(db, models.ExtractedField).values([
+            {
+                "document_id": document_id,
+                "business_id": current_user.business_id,
+                "field_name": field_name,
+                "value": value,
+                "confidence": None  # User-corrected fields have no confidence score
+            }
+            for field_name, value in field_values.items()
+        ])
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[
+                models.ExtractedField.document_id,
+                models.ExtractedField.business_id,
+                models.ExtractedField.field_name
+            ],
+            set_={"value": upsert.excluded.value, "updated_at": func.now()}
+        ).returning(models.ExtractedField)
+        upserted_fields = db.scalars(upsert, execution_options={"populate_existing": True}).all()
+        added_fields = [field for field in upserted_fields if field.field_name not in existing_fields]
+        if added_fields:
+            all_fields.extend(added_fields)
+            all_fields.sort(key=lambda f: f.field_name)
+        
+        # Incremented in SQL so concurrent corrections don't lose counts
+        document.corrections_count = models.Document.corrections_count + len(correction_rows)
+        
+        # Build field responses with corrections overlay before commit expires the objects
+        field_responses = build_field_responses_from_maps(all_fields, latest_corrections)
+        
+        db.commit()
+        invalidate_document_list_cache(current_user.business_id)
+        logger.info("Applied %d corrections to document %s", corrections_applied, document_id)
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Failed to commit corrections for document {document_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to save corrections to database"
+        )
+    
+    logger.info(
+        "Field corrections completed for document %s: %d applied, %d failed",
+        document_id, corrections_applied, corrections_failed
+    )
     
     return FieldCorrectionsResponse(
         document_id=document_id,
@@ -541,11 +676,12 @@ async def correct_document_fields(
     )
 
 
-@router.put("/{document_id}/line-items/{item_id}", response_model=LineItemUpdateResponse)
-async def update_line_item(
+@router.put("/{document_id}/line-items/{item_id}", response_model=LineItemUpdateResponse, response_class=ORJSONResponse)
+def update_line_item(
     document_id: UUID,
     item_id: int,
     update_request: LineItemUpdateRequest,
+    background_tasks: BackgroundTasks,
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -568,11 +704,16 @@ async def update_line_item(
     
     Returns updated line item details.
     """
+    # Reject an empty update before touching the database
+    update_data = update_request.model_dump(exclude_unset=True)
+    if not update_data:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one field must be provided for update"
+        )
+    
     # Validate user has access to document
-    document = db.query(models.Document).filter(
-        models.Document.id == document_id,
-        models.Document.business_id == current_user.business_id
-    ).first()
+    document = DocumentQueryService.get_business_document(db, document_id, current_user.business_id)
     
     if not document:
         raise HTTPException(
@@ -587,87 +728,111 @@ async def update_line_item(
             detail=f"Cannot edit line items for document in {document.status.value} status. models.Document must be COMPLETED."
         )
     
-    # Get the line item and verify it belongs to this document
-    line_item = db.query(models.LineItem).filter(
-        models.LineItem.id == item_id,
-        models.LineItem.document_id == document_id,
-        models.LineItem.business_id == current_user.business_id
-    ).first()
-    
-    if not line_item:
+    # Update the line item in one statement. Joining the row to itself as "old"
+    # lets RETURNING report the pre-update values for the audit log, since
+    # RETURNING alone only sees the new row; updated_at comes from onupdate.
+    line_item = models.LineItem.__table__.c
+    old = models.LineItem.__table__.alias("old_line_items").c
+    try:
+        row = db.execute(
+            update(models.LineItem.__table__)
+            .where(
+                line_item.id == item_id,
+                line_item.document_id == document_id,
+                line_item.business_id == current_user.business_id,
+                old.id == line_item.id
+            )
+            .values(**update_data)
+            .returning(
+                line_item.id,
+                line_item.description,
+                line_item.quantity,
+                line_item.unit_price,
+                line_item.total,
+                line_item.confidence,
+                line_item.created_at,
+                line_item.updated_at,
+                old.description.label("original_description"),
+                old.quantity.label("original_quantity"),
+                old.unit_price.label("original_unit_price"),
+                old.total.label("original_total")
+            )
+        ).first()
+        if row is not None:
+            db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Failed to update line item {item_id} for document {document_id}: {str(e)}")
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Line item not found or does not belong to this document"
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update line item"
         )
     
-    # Check if at least one field is being updated
-    update_data = update_request.model_dump(exclude_unset=True)
-    if not update_data:
+    if row is None:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="At least one field must be provided for update"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Line item not found or does not belong to this document"
         )
     
-    # Store original values for logging
     original_values = {
-        "description": line_item.description,
-        "quantity": line_item.quantity,
-        "unit_price": line_item.unit_price,
-        "total": line_item.total
+        "description": row.original_description,
+        "quantity": row.original_quantity,
+        "unit_price": row.original_unit_price,
+        "total": row.original_total
     }
     
-    try:
-        # Update the line item with provided fields
-        for field, value in update_data.items():
-            if hasattr(line_item, field):
-                setattr(line_item, field, value)
-        
-        # Update the timestamp
-        line_item.updated_at = func.now()
-        
-        # Commit the changes
-        db.commit()
-        db.refresh(line_item)
-        
-        # Log the update for audit purposes
-        updated_fields = list(update_data.keys())
-        logger.info(f"Line item {item_id} updated for document {document_id} by user {current_user.id}. "
-                   f"Updated fields: {updated_fields}. "
-                   f"Original values: {original_values}")
-        
-        # Create response with updated line item
-        line_item_response = LineItemResponse(
-            id=line_item.id,
-            description=line_item.description,
-            quantity=float(line_item.quantity) if line_item.quantity else None,
-            unit_price=float(line_item.unit_price) if line_item.unit_price else None,
-            total=float(line_item.total) if line_item.total else None,
-            confidence=line_item.confidence,
-            is_low_confidence=is_low_confidence(line_item.confidence),
-            created_at=line_item.created_at,
-            updated_at=line_item.updated_at
-        )
-        
-        logger.info(f"Successfully updated line item {item_id} for document {document_id}")
-        
-        return LineItemUpdateResponse(
-            success=True,
-            message=f"Line item updated successfully. Updated fields: {', '.join(updated_fields)}",
-            line_item=line_item_response,
-            document_id=document_id
-        )
-        
-    except Exception as e:
-        db.rollback()
-        logger.error(f"Failed to update line item {item_id} for document {document_id}: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to update line item"
-        )
+    # The values were just validated by LineItemUpdateRequest and written (and
+    # the Numeric columns load as float), so skip re-validation
+    line_item_response = LineItemResponse.model_construct(
+        id=row.id,
+        description=row.description,
+        quantity=row.quantity,
+        unit_price=row.unit_price,
+        total=row.total,
+        confidence=row.confidence,
+        created_at=row.created_at,
+        updated_at=row.updated_at
+    )
+    
+    # Log the update for audit purposes once the response has been sent
+    updated_fields = tuple(update_data)
+    background_tasks.add_task(
+        logger.info,
+        "Line item %s updated for document %s by user %s. Updated fields: %s. Original values: %s",
+        item_id, document_id, current_user.id, updated_fields, original_values
+    )
+    
+    return LineItemUpdateResponse(
+        success=True,
+        message="Line item updated successfully. Updated fields: " + ", ".join(updated_fields),
+        line_item=line_item_response,
+        document_id=document_id
+    )
+
+
+@router.post("/mark-reviewed", response_model=BulkMarkReviewedResponse, response_class=ORJSONResponse)
+def mark_documents_reviewed(
+    review_request: BulkMarkReviewedRequest,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Mark several documents as reviewed by the current user in one request.
+    
+    All matching documents are updated in a single statement and transaction.
+    IDs that do not exist, belong to another business, or are not in COMPLETED
+    status are not updated and are returned in skipped_ids.
+    """
+    return DocumentManagementService.mark_documents_reviewed(
+        db=db,
+        document_ids=review_request.document_ids,
+        user_id=current_user.id,
+        business_id=current_user.business_id
+    )
 
 
-@router.post("/{document_id}/mark-reviewed", response_model=MarkReviewedResponse)
-async def mark_document_reviewed(
+@router.post("/{document_id}/mark-reviewed", response_model=MarkReviewedResponse, response_class=ORJSONResponse)
+def mark_document_reviewed(
     document_id: UUID,
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -681,7 +846,8 @@ async def mark_document_reviewed(
     Requirements:
     - User must have access to the document (same business)
     - Document must be in COMPLETED status for review
-    - Can be marked as reviewed multiple times (updates timestamp and reviewer)
+    - Can be marked as reviewed multiple times (updates timestamp and reviewer); a repeat
+      by the same user within a few seconds returns the existing review unchanged
     
     Note: Marking as reviewed does not prevent future edits to the document.
     It's primarily used for tracking which documents have been validated by users.
@@ -697,7 +863,7 @@ async def mark_document_reviewed(
 
 
 @router.put("/{document_id}/tag", response_model=DocumentTagResponse)
-async def tag_document(
+def tag_document(
     document_id: UUID,
     tag_request: DocumentTagRequest,
     current_user: models.User = Depends(get_current_user),
@@ -722,92 +888,113 @@ async def tag_document(
     
     Returns updated document metadata with tag information.
     """
-    # Validate user has access to document
-    document = db.query(models.Document).filter(
-        models.Document.id == document_id,
-        models.Document.business_id == current_user.business_id
-    ).first()
+    business_id = current_user.business_id
     
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found or access denied"
-        )
+    # Ownership checks for the provided tags, in the order their errors are reported
+    reference_checks = []
     
     # Validate client ownership if client_id is provided
     if tag_request.client_id is not None:
-        client = db.query(models.Client).filter(
-            models.Client.id == tag_request.client_id,
-            models.Client.business_id == current_user.business_id
-        ).first()
-        
-        if not client:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Client not found or access denied. Client must belong to your business."
-            )
+        reference_checks.append((
+            select(models.Client.id).where(
+                models.Client.id == tag_request.client_id,
+                models.Client.business_id == business_id
+            ).exists(),
+            "Client not found or access denied. Client must belong to your business."
+        ))
     
     # Validate project ownership if project_id is provided  
     if tag_request.project_id is not None:
-        project = db.query(models.Project).filter(
-            models.Project.id == tag_request.project_id,
-            models.Project.business_id == current_user.business_id
-        ).first()
-        
-        if not project:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Project not found or access denied. Project must belong to your business."
-            )
+        reference_checks.append((
+            select(models.Project.id).where(
+                models.Project.id == tag_request.project_id,
+                models.Project.business_id == business_id
+            ).exists(),
+            "Project not found or access denied. Project must belong to your business."
+        ))
     
     # Validate category exists if category_id is provided (categories are global)
     if tag_request.category_id is not None:
-        category = db.query(models.Category).filter(
-            models.Category.id == tag_request.category_id
-        ).first()
-        
-        if not category:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Category not found."
-            )
+        reference_checks.append((
+            select(models.Category.id).where(
+                models.Category.id == tag_request.category_id
+            ).exists(),
+            "Category not found."
+        ))
+    
+    # Update document with tag information (only update fields that are explicitly provided).
+    # Document access and every tag check are folded into the UPDATE's WHERE clause, so
+    # the success path is a single round trip; updated_at is always set so the response
+    # reports when the document was touched, and is stamped here so it needn't be read back.
+    update_data = tag_request.model_dump(exclude_unset=True)
+    tagged_at = datetime.now(timezone.utc)
     
     try:
-        # Update document with tag information (only update fields that are explicitly provided)
-        update_data = tag_request.model_dump(exclude_unset=True)
-        
-        if "client_id" in update_data:
-            document.client_id = tag_request.client_id
-        if "project_id" in update_data:
-            document.project_id = tag_request.project_id  
-        if "category_id" in update_data:
-            document.category_id = tag_request.category_id
-            
-        document.updated_at = func.now()
-        
-        # Commit the changes
-        db.commit()
-        db.refresh(document)
-        
-        # Log the tagging operation for audit purposes
-        logger.info(f"Document {document_id} tagged by user {current_user.id}. "
-                   f"Client: {tag_request.client_id}, Project: {tag_request.project_id}, "
-                   f"Category: {tag_request.category_id}")
-        
-        return DocumentTagResponse(
-            success=True,
-            message="Document tagged successfully",
-            document_id=document_id,
-            client_id=document.client_id,
-            project_id=document.project_id,
-            category_id=document.category_id,
-            updated_at=document.updated_at
-        )
-        
-    except Exception as e:
+        row = db.execute(
+            update(models.Document)
+            .where(
+                models.Document.id == document_id,
+                models.Document.business_id == business_id,
+                *(check for check, _ in reference_checks)
+            )
+            .values(**update_data, updated_at=tagged_at)
+            .returning(
+                models.Document.client_id,
+                models.Document.project_id,
+                models.Document.category_id
+            ),
+            execution_options={"synchronize_session": False}
+        ).first()
+        if row is not None:
+            db.commit()
+    except SQLAlchemyError as e:
         db.rollback()
         logger.error(f"Failed to tag document {document_id}: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to tag document"
-        )
\ No newline at end of file
+        )
+    
+    if row is None:
+        # Nothing matched; find out which check failed to report it
+        document_exists, *references_exist = db.execute(select(
+            select(models.Document.id).where(
+                models.Document.id == document_id,
+                models.Document.business_id == business_id
+            ).exists(),
+            *(check for check, _ in reference_checks)
+        )).one()
+        if document_exists:
+            for (_, detail), exists in zip(reference_checks, references_exist):
+                if not exists:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=detail
+                    )
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found or access denied"
+        )
+    
+    # Every value comes from the validated request or the RETURNING row
+    tag_response = DocumentTagResponse.model_construct(
+        success=True,
+        message="Document tagged successfully",
+        document_id=document_id,
+        client_id=row.client_id,
+        project_id=row.project_id,
+        category_id=row.category_id,
+        updated_at=tagged_at
+    )
+    
+    invalidate_document_list_cache(business_id)
+    
+    # Log the tagging operation for audit purposes
+    logger.info(
+        "Document %s tagged by user %s. Client: %s, Project: %s, Category: %s",
+        document_id, current_user.id,
+        tag_request.client_id, tag_request.project_id, tag_request.category_id
+    )
+    
+    # Returned as a response so FastAPI doesn't re-validate it against response_model
+    return ORJSONResponse(tag_response.model_dump())
\ No newline at end of file
@@ -1,7 +1,14 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+import hashlib
+import threading
+from typing import List, Optional
+import orjson
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from .. import models, schemas
+from ..db import upsert_insert
 from ..dependencies import get_db, get_current_user
 
 router = APIRouter(
@@ -9,6 +16,17 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+# Categories are global and rarely change, so every caller shares one serialized
+# list and its ETag for a minute instead of querying and encoding per request
+_categories_cache: TTLCache = TTLCache(maxsize=1, ttl=60)
+_categories_cache_lock = threading.Lock()
+
+
+def clear_categories_cache() -> None:
+    """Drop the cached category list"""
+    with _categories_cache_lock:
+        _categories_cache.clear()
+
 
 
 @router.post("/projects", response_model=schemas.Project)
@@ -18,29 +36,27 @@ def create_project(
     current_user: models.User = Depends(get_current_user)
 ):
     """Create a new project for the current user's business"""
-    # Check if project with the same name already exists for this business
-    existing_project = db.query(models.Project).filter(
-        models.Project.business_id == current_user.business_id,
-        models.Project.name == project.name
+    # Create new project; a name already used by this business hits the unique
+    # constraint and returns no row, so there is no separate existence check
+    db_project = db.scalars(
+        upsert_insert(db, models.Project)
+        .values(name=project.name, business_id=current_user.business_id)
+        .on_conflict_do_nothing(index_elements=[models.Project.business_id, models.Project.name])
+        .returning(models.Project)
     ).first()
     
-    if existing_project:
+    if db_project is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Project with this name already exists for your business"
         )
     
-    # Create new project
-    db_project = models.Project(
-        name=project.name,
-        business_id=current_user.business_id
-    )
-    
-    db.add(db_project)
+    # Serialize from the RETURNING row before commit expires it, which would
+    # otherwise cost a SELECT when the response is rendered
+    response = schemas.Project.model_validate(db_project)
     db.commit()
-    db.refresh(db_project)
     
-    return db_project
+    return response
 
 
 @router.get("/projects", response_model=List[schemas.Project])
@@ -50,19 +66,38 @@ def list_projects(
 ):
     """List all projects for the current user's business"""
     # Query projects scoped to the user's business
-    projects = db.query(models.Project).filter(
-        models.Project.business_id == current_user.business_id
-    ).order_by(models.Project.name).all()
+    projects = db.execute(
+        select(models.Project.id, models.Project.name, models.Project.business_id, models.Project.created_at)
+        .where(models.Project.business_id == current_user.business_id)
+        .order_by(models.Project.name)
+    ).mappings().all()
     
-    return projects
+    # Returned as a response so FastAPI skips re-validating every row against
+    # response_model, which still documents the route
+    return ORJSONResponse([dict(project) for project in projects])
 
 
 @router.get("/categories", response_model=List[schemas.Category])
 def list_categories(
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
     """List all available categories"""
     # Categories are global, but still require authentication
-    categories = db.query(models.Category).order_by(models.Category.name).all()
-    return categories
\ No newline at end of file
+    with _categories_cache_lock:
+        cached = _categories_cache.get("categories")
+    if cached is None:
+        categories = db.execute(
+            select(models.Category.id, models.Category.name, models.Category.created_at)
+            .order_by(models.Category.name)
+        ).mappings().all()
+        body = orjson.dumps([dict(category) for category in categories])
+        cached = (body, f'"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"')
+        with _categories_cache_lock:
+            _categories_cache["categories"] = cached
+    
+    body, etag = cached
+    if if_none_match == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
\ No newline at end of file
@@ -1,129 +1,98 @@
-# Auth schemas
-from .auth import (
-    SignupRequest,
-    LoginRequest,
-    Token,
-    UserResponse,
-    BusinessResponse,
-    SignupResponse,
-    LoginResponse
-)
+import importlib
 
-# Document schemas
-from .document import (
-    DocumentUploadResult,
-    DocumentUploadResponse,
-    DocumentBase,
-    DocumentCreate,
-    DocumentResponse,
-    DocumentFilters,
-    PaginationMeta,
-    DocumentListResponse,
-    ExtractedFieldResponse,
-    LineItemResponse,
-    DocumentFieldsResponse,
-    FieldCorrectionRequest,
-    FieldCorrectionsRequest,
-    FieldCorrectionResult,
-    FieldCorrectionsResponse,
-    LineItemUpdateRequest,
-    LineItemUpdateResponse,
-    MarkReviewedRequest,
-    MarkReviewedResponse,
-    DocumentTagRequest,
-    DocumentTagResponse
-)
-
-# User schemas
-from .user import UserBase
-
-# Item schemas  
-from .item import ItemBase
-
-# Client schemas
-from .client import (
-    ClientBase,
-    ClientCreate,
-    Client
-)
-
-# Project schemas
-from .project import (
-    ProjectBase,
-    ProjectCreate,
-    Project
-)
-
-# Category schemas
-from .category import (
-    CategoryBase,
-    Category
-)
-
-# Column Profile schemas
-from .column_profile import (
-    ColumnProfileBase,
-    ColumnProfileCreate,
-    ColumnProfileResponse,
-    ColumnProfileFilters,
-    ColumnProfileListResponse,
-    ColumnProfileSimilarityRequest,
-    ColumnProfileSimilarityResponse
-)
-
-# Make all schemas available at package level
-__all__ = [
+# Schema name -> submodule defining it. Names are resolved on first access
+# (PEP 562), so a process only imports the schema modules it actually uses.
+_EXPORTS = {
     # Auth
-    "SignupRequest",
-    "LoginRequest", 
-    "Token",
-    "UserResponse",
-    "BusinessResponse",
-    "SignupResponse",
-    "LoginResponse",
+    "auth": (
+        "SignupRequest",
+        "LoginRequest",
+        "Token",
+        "UserResponse",
+        "BusinessResponse",
+        "SignupResponse",
+        "LoginResponse",
+    ),
     # Document
-    "DocumentUploadResult",
-    "DocumentUploadResponse",
-    "DocumentBase",
-    "DocumentCreate", 
-    "DocumentResponse",
-    "DocumentFilters",
-    "PaginationMeta",
-    "DocumentListResponse",
-    "ExtractedFieldResponse",
-    "LineItemResponse",
-    "DocumentFieldsResponse",
-    "FieldCorrectionRequest",
-    "FieldCorrectionsRequest",
-    "FieldCorrectionResult",
-    "FieldCorrectionsResponse",
-    "LineItemUpdateRequest",
-    "LineItemUpdateResponse",
-    "MarkReviewedRequest",
-    "MarkReviewedResponse",
-    "DocumentTagRequest",
-    "DocumentTagResponse",
+    "document": (
+        "DocumentUploadResult",
+        "DocumentUploadResponse",
+        "UploadTaskStatusResponse",
+        "DocumentBase",
+        "DocumentCreate",
+        "DocumentResponse",
+        "DocumentFilters",
+        "PaginationMeta",
+        "DocumentListResponse",
+        "ExtractedFieldResponse",
+        "LineItemResponse",
+        "DocumentFieldsResponse",
+        "FieldCorrectionRequest",
+        "FieldCorrectionsRequest",
+        "FieldCorrectionResult",
+        "FieldCorrectionsResponse",
+        "LineItemUpdateRequest",
+        "LineItemUpdateResponse",
+        "MarkReviewedRequest",
+        "MarkReviewedResponse",
+        "BulkMarkReviewedRequest",
+        "ReviewedDocument",
+        "BulkMarkReviewedResponse",
+        "DocumentTagRequest",
+        "DocumentTagResponse",
+    ),
     # User
-    "UserBase",
+    "user": (
+        "UserBase",
+    ),
     # Item
-    "ItemBase",
+    "item": (
+        "ItemBase",
+    ),
     # Client
-    "ClientBase",
-    "ClientCreate",
-    "Client",
+    "client": (
+        "ClientBase",
+        "ClientCreate",
+        "Client",
+    ),
     # Project
-    "ProjectBase",
-    "ProjectCreate",
-    "Project",
+    "project": (
+        "ProjectBase",
+        "ProjectCreate",
+        "Project",
+    ),
     # Category
-    "CategoryBase",
-    "Category",
+    "category": (
+        "CategoryBase",
+        "Category",
+    ),
     # Column Profile
-    "ColumnProfileBase",
-    "ColumnProfileCreate",
-    "ColumnProfileResponse",
-    "ColumnProfileFilters",
-    "ColumnProfileListResponse",
-    "ColumnProfileSimilarityRequest",
-    "ColumnProfileSimilarityResponse"
-]
\ No newline at end of file
+    "column_profile": (
+        "ColumnProfileBase",
+        "ColumnProfileCreate",
+        "ColumnProfileResponse",
+        "ColumnProfileFilters",
+        "ColumnProfileListResponse",
+        "ColumnProfileSimilarityRequest",
+        "ColumnProfileSimilarityResponse",
+    ),
+}
+
+_LAZY = {name: module for module, names in _EXPORTS.items() for name in names}
+
+# Make all schemas available at package level
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,16 +1,23 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
 from decimal import Decimal
 from ..enums import FileType, DocumentType, DocumentStatus, DocumentClassification
 
+# Confidence scores below this (or missing) are flagged for user review
+LOW_CONFIDENCE_THRESHOLD = 0.7
+# Lower bounds of the high and medium buckets in the fields summary
+HIGH_CONFIDENCE_THRESHOLD = 0.8
+MEDIUM_CONFIDENCE_THRESHOLD = 0.5
+
 
 class DocumentUploadResult(BaseModel):
     """Result of uploading a single document"""
     success: bool
     filename: str
     document_id: Optional[UUID] = None
+    task_id: Optional[str] = Field(None, description="Upload task to poll at /documents/uploads/{task_id}")
     blob_url: Optional[str] = None
     error_message: Optional[str] = None
     file_size: Optional[int] = None
@@ -25,6 +32,15 @@ class DocumentUploadResponse(BaseModel):
     results: List[DocumentUploadResult]
 
 
+class UploadTaskStatusResponse(BaseModel):
+    """Status of a queued document upload"""
+    task_id: str
+    state: str = Field(description="Task state: PENDING, STARTED, RETRY, SUCCESS or FAILURE")
+    document_id: Optional[UUID] = Field(None, description="Registered document, once the upload succeeded")
+    blob_url: Optional[str] = None
+    error_message: Optional[str] = None
+
+
 class DocumentBase(BaseModel):
     """Base document schema"""
     filename: str
@@ -50,13 +66,17 @@ class DocumentResponse(DocumentBase):
     confidence_score: Optional[float] = None
     reviewed_at: Optional[datetime] = Field(None, description="When document was marked as reviewed")
     reviewed_by: Optional[int] = Field(None, description="User ID who reviewed the document")
-    is_reviewed: bool = Field(description="True if document has been reviewed")
     created_at: datetime
     updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
 
+    @computed_field(description="True if document has been reviewed")
+    @property
+    def is_reviewed(self) -> bool:
+        return self.reviewed_at is not None
+
 
 class DocumentFilters(BaseModel):
     """Filters for document listing"""
@@ -73,10 +93,11 @@ class PaginationMeta(BaseModel):
     """Pagination metadata"""
     page: int = Field(ge=1, description="Current page number")
     per_page: int = Field(ge=1, le=100, description="Items per page")
-    total_items: int = Field(ge=0, description="Total number of items")
-    total_pages: int = Field(ge=0, description="Total number of pages")
+    total_items: Optional[int] = Field(None, ge=0, description="Total number of items (omitted for cursor pages unless include_total is set)")
+    total_pages: Optional[int] = Field(None, ge=0, description="Total number of pages (omitted for cursor pages unless include_total is set)")
     has_next: bool = Field(description="Whether there is a next page")
     has_prev: bool = Field(description="Whether there is a previous page")
+    next_cursor: Optional[str] = Field(None, description="Cursor for fetching the next page by keyset")
 
 
 class DocumentListResponse(BaseModel):
@@ -110,13 +131,17 @@ class LineItemResponse(BaseModel):
     unit_price: Optional[float] = None
     total: Optional[float] = None
     confidence: Optional[float] = None
-    is_low_confidence: bool = Field(description="True if confidence < 0.7")
     created_at: datetime
     updated_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
 
+    @computed_field(description="True if confidence < 0.7")
+    @property
+    def is_low_confidence(self) -> bool:
+        return self.confidence is None or self.confidence < LOW_CONFIDENCE_THRESHOLD
+
 
 class DocumentFieldsResponse(BaseModel):
     """Response schema for document fields endpoint"""
@@ -190,6 +215,26 @@ class MarkReviewedResponse(BaseModel):
     reviewed_by: int = Field(description="User ID who marked document as reviewed")
 
 
+class BulkMarkReviewedRequest(BaseModel):
+    """Request schema for marking several documents as reviewed at once"""
+    document_ids: List[UUID] = Field(min_length=1, max_length=500, description="IDs of documents to mark as reviewed")
+
+
+class ReviewedDocument(BaseModel):
+    """A document marked as reviewed by the bulk endpoint"""
+    document_id: UUID
+    reviewed_at: datetime
+
+
+class BulkMarkReviewedResponse(BaseModel):
+    """Response schema for bulk mark reviewed endpoint"""
+    success: bool
+    message: str
+    reviewed_by: int = Field(description="User ID who marked the documents as reviewed")
+    reviewed: List[ReviewedDocument] = Field(description="Documents marked as reviewed")
+    skipped_ids: List[UUID] = Field(description="Requested IDs that were not found, not accessible, or not COMPLETED")
+
+
 class DocumentTagRequest(BaseModel):
     """Request schema for tagging a document"""
     client_id: Optional[int] = Field(None, description="ID of client to associate with document")
@@ -1,5 +1,6 @@
 from datetime import timedelta
 from typing import Optional
+from sqlalchemy import exists, select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
@@ -13,6 +14,19 @@ from ..auth import (
 )
 from ..schemas import SignupRequest, LoginRequest, SignupResponse, LoginResponse, UserResponse, BusinessResponse
 
+# Token lifetime is fixed for the process, so it is built once
+_ACCESS_TOKEN_EXPIRES = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+
+
+def _orm_to_schema(model_cls, orm_obj):
+    """
+    Build a response schema from a freshly loaded ORM object without validation.
+    
+    The values come straight from the database columns and are already typed,
+    so the per-field validation of model_validate is skipped.
+    """
+    return model_cls.model_construct(**{field: getattr(orm_obj, field) for field in model_cls.model_fields})
+
 
 class AuthService:
     """Service for handling authentication business logic."""
@@ -20,16 +34,15 @@ class AuthService:
     @staticmethod
     def check_user_exists(db: Session, email: str) -> bool:
         """Check if a user with the given email already exists."""
-        existing_user = db.query(models.User).filter(models.User.email == email).first()
-        return existing_user is not None
+        # EXISTS probe on the unique email index; no User row is loaded
+        return bool(db.scalar(select(exists().where(models.User.email == email))))
     
     @staticmethod
     def create_access_token_for_user(user: models.User) -> str:
         """Create an access token for the given user."""
-        access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         return auth_create_access_token(
             data={"sub": user.email, "user_id": user.id, "business_id": user.business_id},
-            expires_delta=access_token_expires
+            expires_delta=_ACCESS_TOKEN_EXPIRES
         )
     
     @staticmethod
@@ -67,8 +80,8 @@ class AuthService:
             access_token = AuthService.create_access_token_for_user(user)
             
             return SignupResponse(
-                user=UserResponse.model_validate(user),
-                business=BusinessResponse.model_validate(user.business),
+                user=_orm_to_schema(UserResponse, user),
+                business=_orm_to_schema(BusinessResponse, user.business),
                 access_token=access_token,
                 token_type="bearer"
             )
@@ -115,7 +128,7 @@ class AuthService:
         access_token = AuthService.create_access_token_for_user(user)
         
         return LoginResponse(
-            user=UserResponse.model_validate(user),
+            user=_orm_to_schema(UserResponse, user),
             access_token=access_token,
             token_type="bearer"
         )
\ No newline at end of file
@@ -1,17 +1,41 @@
 import os
+import threading
 import uuid
 from typing import Optional
 from datetime import datetime, timedelta
 from fastapi import UploadFile, HTTPException
-from azure.storage.blob import BlobServiceClient, ContentSettings, generate_blob_sas, BlobSasPermissions
+from azure.storage.blob import BlobServiceClient, ContentSettings, ExponentialRetry, generate_blob_sas, BlobSasPermissions
 from azure.core.exceptions import AzureError
 import logging
 
 from ..core.settings import get_settings
-from ..enums import FileType
 
 logger = logging.getLogger(__name__)
 
+# Throttled (503) and timed-out (408) blob requests are retried by the SDK with
+# exponential backoff of roughly 1s, 3s and 5s plus jitter before giving up.
+UPLOAD_RETRY_POLICY = dict(initial_backoff=1, increment_base=2, retry_total=3)
+
+# The SDK buffers a whole stream in memory when it fits in one Put Blob (64MB by
+# default), which covers every upload we accept. Capping the single-put and
+# block sizes makes larger files go up as staged 4MB blocks read from the
+# stream one at a time, so memory per upload stays at one block.
+UPLOAD_TRANSFER_OPTIONS = dict(max_single_put_size=4 * 1024 * 1024, max_block_size=4 * 1024 * 1024)
+
+# Upload validation tables, built once instead of on every call
+_CONTENT_TYPES = {
+    "pdf": "application/pdf",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "png": "image/png"
+}
+_VALID_MIME_TYPES = frozenset({"application/pdf", "image/jpeg", "image/jpg", "image/png"})
+
+
+def _get_extension(filename: str) -> str:
+    """Lowercase extension without the dot, or an empty string if there is none"""
+    return filename.rpartition(".")[2].lower() if "." in filename else ""
+
 
 class AzureBlobService:
     """Service for handling Azure Blob Storage operations"""
@@ -22,9 +46,13 @@ class AzureBlobService:
             settings = get_settings()
             logger.info(f"Initializing Azure Blob Service with account: {settings.azure_storage_account_name}")
             self.blob_service_client = BlobServiceClient.from_connection_string(
-                settings.azure_connection_string
+                settings.azure_connection_string,
+                retry_policy=ExponentialRetry(**UPLOAD_RETRY_POLICY),
+                **UPLOAD_TRANSFER_OPTIONS
             )
             self.container_name = settings.azure_blob_container_name
+            # Caps concurrent uploads across the worker threads of this process
+            self._upload_semaphore = threading.BoundedSemaphore(settings.max_inflight_uploads)
             self._ensure_container_exists()
         except Exception as e:
             logger.error(f"Failed to initialize Azure Blob Service: {e}")
@@ -71,61 +99,30 @@ class AzureBlobService:
         if not file.filename:
             return False
         
-        # Get file extension
-        file_extension = os.path.splitext(file.filename)[1].lower()
-        
         # Check against valid extensions
-        valid_extensions = {".pdf", ".jpg", ".jpeg", ".png"}
-        if file_extension not in valid_extensions:
+        if _get_extension(file.filename) not in _CONTENT_TYPES:
             return False
         
         # Also check MIME type if available
-        if file.content_type:
-            valid_mime_types = {
-                "application/pdf",
-                "image/jpeg", 
-                "image/jpg",
-                "image/png"
-            }
-            if file.content_type.lower() not in valid_mime_types:
-                return False
+        if file.content_type and file.content_type.lower() not in _VALID_MIME_TYPES:
+            return False
         
         return True
     
-    def _get_file_type_from_filename(self, filename: str) -> FileType:
-        """
-        Determine FileType enum from filename extension
-        
-        Args:
-            filename: Name of the file
-            
-        Returns:
-            FileType: Corresponding enum value
-        """
-        extension = os.path.splitext(filename)[1].lower()
-        
-        if extension == ".pdf":
-            return FileType.PDF
-        elif extension in [".jpg", ".jpeg"]:
-            return FileType.JPG
-        elif extension == ".png":
-            return FileType.PNG
-        else:
-            raise ValueError(f"Unsupported file extension: {extension}")
-    
-    def _generate_blob_name(self, user_id: uuid.UUID, filename: str) -> str:
+    def _generate_blob_name(self, user_id: uuid.UUID, filename: str, file_id: Optional[str] = None) -> str:
         """
         Generate a unique blob name with user-specific path
         
         Args:
             user_id: UUID of the user uploading the file
             filename: Original filename
+            file_id: Stable ID to name the blob after; a fresh UUID if omitted
             
         Returns:
             str: Unique blob name with path
         """
         # Generate unique ID for the file
-        file_id = uuid.uuid4()
+        file_id = file_id or uuid.uuid4()
         
         # Get file extension
         _, extension = os.path.splitext(filename)
@@ -135,78 +132,51 @@ class AzureBlobService:
         
         return blob_name
     
-    async def upload_file(self, file: UploadFile, user_id: uuid.UUID) -> str:
+    def upload_spooled_file(
+        self,
+        path: str,
+        user_id: int,
+        document_id: str,
+        filename: str,
+        content_type: Optional[str] = None
+    ) -> str:
         """
-        Upload file to Azure Blob Storage in user-specific container path
+        Upload a spooled file from local disk to Azure Blob Storage
+        
+        Used by the upload worker, which runs outside the event loop, so this
+        goes through the sync client and lets AzureError propagate to the task.
+        The blob is named after the document, so a retried upload overwrites
+        the blob from the failed attempt instead of leaving an orphan behind.
         
         Args:
-            file: FastAPI UploadFile object
-            user_id: UUID of the user uploading the file
+            path: Path of the spooled upload on disk
+            user_id: ID of the user who uploaded the file
+            document_id: UUID string of the document the file belongs to
+            filename: Original filename
+            content_type: MIME type sent by the client, if any
             
         Returns:
             str: URL of the uploaded blob
-            
-        Raises:
-            HTTPException: If upload fails or file validation fails
         """
-        # Validate file type
-        if not self.validate_file_type(file):
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid file type. Only PDF, JPG, and PNG files are allowed."
-            )
-        
-        if not file.filename:
-            raise HTTPException(
-                status_code=400,
-                detail="Filename is required"
-            )
+        blob_name = self._generate_blob_name(user_id, filename, document_id)
+        blob_client = self.blob_service_client.get_blob_client(
+            container=self.container_name,
+            blob=blob_name
+        )
+        content_type = content_type or self._get_content_type_from_filename(filename)
         
-        try:
-            # Generate unique blob name
-            blob_name = self._generate_blob_name(user_id, file.filename)
-            
-            # Get blob client
-            blob_client = self.blob_service_client.get_blob_client(
-                container=self.container_name,
-                blob=blob_name
-            )
-            
-            # Read file content
-            file_content = await file.read()
-            
-            # Reset file position for potential future reads
-            await file.seek(0)
-            
-            # Determine content type
-            content_type = file.content_type or self._get_content_type_from_filename(file.filename)
-            
-            # Upload the blob
+        # Stream from disk in staged blocks, bounded by the in-flight cap
+        with self._upload_semaphore, open(path, "rb") as data:
             blob_client.upload_blob(
-                data=file_content,
+                data=data,
+                length=os.path.getsize(path),
                 overwrite=True,
                 content_settings=ContentSettings(content_type=content_type)
             )
-            
-            # Return the blob URL
-            blob_url = blob_client.url
-            
-            logger.info(f"Successfully uploaded file {file.filename} for user {user_id} to {blob_url}")
-            
-            return blob_url
-            
-        except AzureError as e:
-            logger.error(f"Azure error during file upload: {e}")
-            raise HTTPException(
-                status_code=500,
-                detail="Failed to upload file to cloud storage"
-            )
-        except Exception as e:
-            logger.error(f"Unexpected error during file upload: {e}")
-            raise HTTPException(
-                status_code=500,
-                detail="An unexpected error occurred during file upload"
-            )
+        
+        logger.info(f"Successfully uploaded file {filename} for user {user_id} to {blob_client.url}")
+        
+        return blob_client.url
     
     def _get_content_type_from_filename(self, filename: str) -> str:
         """
@@ -218,16 +188,7 @@ class AzureBlobService:
         Returns:
             str: MIME content type
         """
-        extension = os.path.splitext(filename)[1].lower()
-        
-        content_types = {
-            ".pdf": "application/pdf",
-            ".jpg": "image/jpeg",
-            ".jpeg": "image/jpeg",
-            ".png": "image/png"
-        }
-        
-        return content_types.get(extension, "application/octet-stream")
+        return _CONTENT_TYPES.get(_get_extension(filename), "application/octet-stream")
     
     async def delete_file(self, blob_url: str) -> bool:
         """
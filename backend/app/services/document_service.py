@@ -1,12 +1,26 @@
-from typing import List, Optional, Dict, Any
-from uuid import UUID
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from typing import List, Optional, Dict, Any, Tuple
+from uuid import UUID, uuid4
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import or_, select, tuple_, update
 from fastapi import HTTPException, status, UploadFile
+import anyio
+import asyncio
+import base64
 import logging
-import math
+import os
+import re
+import shutil
+import threading
+from functools import lru_cache, partial
+from cachetools import TTLCache
 
 from .. import models
+from ..core.celery import celery_app
+from ..core.settings import get_settings
+from ..core.uploads import MAX_FILE_SIZE, MAX_FILES_PER_UPLOAD
 from ..enums import FileType, DocumentType, DocumentStatus, DocumentClassification
 from ..schemas import (
     DocumentUploadResult, 
@@ -21,41 +35,130 @@ from ..schemas import (
     FieldCorrectionResult,
     LineItemUpdateRequest,
     LineItemUpdateResponse,
-    MarkReviewedResponse
+    MarkReviewedResponse,
+    BulkMarkReviewedResponse,
+    ReviewedDocument,
+    UploadTaskStatusResponse
 )
 from .blob import get_azure_blob_service
-from ..tasks.ocr import dispatch_ocr_task
+from ..tasks.document_tasks import dispatch_upload_task
 
 logger = logging.getLogger(__name__)
 
-# File size limit: 10MB
-MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB in bytes
+# Repeat mark-reviewed clicks by the same reviewer within this window are not rewritten
+REVIEW_IDEMPOTENCY_WINDOW = timedelta(seconds=5)
+
+# Extension (without the dot, lowercased) -> FileType
+_EXTENSION_FILE_TYPES = {
+    "pdf": FileType.PDF,
+    "jpg": FileType.JPG,
+    "jpeg": FileType.JPG,
+    "png": FileType.PNG,
+}
+
+# Filename keyword matchers; invoice keywords take precedence over receipt ones
+_INVOICE_KEYWORDS_RE = re.compile(r"invoice|bill|inv", re.IGNORECASE)
+_RECEIPT_KEYWORDS_RE = re.compile(r"receipt|rec", re.IGNORECASE)
+
+_DOCUMENT_TYPE_CLASSIFICATIONS = {
+    DocumentType.INVOICE: DocumentClassification.REVENUE,
+    DocumentType.RECEIPT: DocumentClassification.EXPENSE,
+}
+
+# Columns read by the document, field and line item response schemas; loading
+# only these keeps tag and classification columns (and any future wide columns)
+# off the wire for listing and detail reads
+DOCUMENT_RESPONSE_COLUMNS = (
+    models.Document.id,
+    models.Document.filename,
+    models.Document.file_type,
+    models.Document.document_type,
+    models.Document.status,
+    models.Document.user_id,
+    models.Document.business_id,
+    models.Document.file_url,
+    models.Document.confidence_score,
+    models.Document.reviewed_at,
+    models.Document.reviewed_by,
+    models.Document.created_at,
+    models.Document.updated_at,
+)
+EXTRACTED_FIELD_RESPONSE_COLUMNS = (
+    models.ExtractedField.id,
+    models.ExtractedField.field_name,
+    models.ExtractedField.value,
+    models.ExtractedField.confidence,
+    models.ExtractedField.created_at,
+    models.ExtractedField.updated_at,
+)
+LINE_ITEM_RESPONSE_COLUMNS = (
+    models.LineItem.id,
+    models.LineItem.description,
+    models.LineItem.quantity,
+    models.LineItem.unit_price,
+    models.LineItem.total,
+    models.LineItem.confidence,
+    models.LineItem.created_at,
+    models.LineItem.updated_at,
+)
+
+_DOCUMENT_RESPONSE_KEYS = tuple(column.key for column in DOCUMENT_RESPONSE_COLUMNS)
+
+
+@lru_cache(maxsize=10_000)
+def _cached_document_response(row: Tuple) -> DocumentResponse:
+    return DocumentResponse.model_validate(dict(zip(_DOCUMENT_RESPONSE_KEYS, row)))
+
+
+def build_document_response(document: models.Document) -> DocumentResponse:
+    """
+    Return the DocumentResponse for a document, reusing one built for an identical row.
+    
+    The cache key is the full tuple of response columns, so any change to the
+    document (including updated_at) misses and builds a fresh response. Cached
+    responses are shared and must not be mutated.
+    """
+    return _cached_document_response(tuple(getattr(document, key) for key in _DOCUMENT_RESPONSE_KEYS))
+
+
+# Short-lived cache for dashboard polling of the document list. Keys start with
+# business_id so writes can drop every cached page for that business.
+_document_list_cache: TTLCache = TTLCache(maxsize=4096, ttl=3)
+_document_list_cache_lock = threading.Lock()
+
+
+def invalidate_document_list_cache(business_id: int) -> None:
+    """Drop every cached document list page for a business"""
+    with _document_list_cache_lock:
+        stale_keys = [key for key in _document_list_cache if key[0] == business_id]
+        for key in stale_keys:
+            _document_list_cache.pop(key, None)
+
+
+def clear_document_list_cache() -> None:
+    """Drop all cached document list pages"""
+    with _document_list_cache_lock:
+        _document_list_cache.clear()
 
 
 class FileValidationService:
     """Service for file validation operations."""
     
     @staticmethod
-    def validate_file_size(file: UploadFile) -> bool:
-        """Validate file size is under the limit"""
-        if not hasattr(file.file, 'seek') or not hasattr(file.file, 'tell'):
-            return True  # Can't check size, allow it
-        
-        # Get current position
-        current_pos = file.file.tell()
-        
-        # Seek to end to get file size
-        file.file.seek(0, 2)
-        file_size = file.file.tell()
-        
-        # Reset to original position
-        file.file.seek(current_pos)
-        
-        return file_size <= MAX_FILE_SIZE
+    def validate_file_size(file: UploadFile) -> Tuple[int, bool]:
+        """Measure the file once and return (size, whether it is under the limit)"""
+        # Unknown sizes come back as 0, so files we can't measure are allowed
+        file_size = FileValidationService.get_file_size(file)
+        return file_size, file_size <= MAX_FILE_SIZE
     
     @staticmethod
     def get_file_size(file: UploadFile) -> int:
         """Get file size in bytes"""
+        # Starlette records the size while parsing the form, so no seek is needed
+        size = getattr(file, "size", None)
+        if isinstance(size, int):
+            return size
+        
         if not hasattr(file.file, 'seek') or not hasattr(file.file, 'tell'):
             return 0
         
@@ -67,32 +170,26 @@ class FileValidationService:
         return file_size
     
     @staticmethod
+    @lru_cache(maxsize=1024)
     def get_file_type_from_filename(filename: str) -> FileType:
         """Get FileType enum from filename extension"""
-        import os
-        extension = os.path.splitext(filename)[1].lower()
-        
-        if extension == ".pdf":
-            return FileType.PDF
-        elif extension in [".jpg", ".jpeg"]:
-            return FileType.JPG
-        elif extension == ".png":
-            return FileType.PNG
-        else:
-            raise ValueError(f"Unsupported file extension: {extension}")
+        extension = filename.rpartition(".")[2].lower() if "." in filename else ""
+        file_type = _EXTENSION_FILE_TYPES.get(extension)
+        if file_type is None:
+            raise ValueError(f"Unsupported file extension: .{extension}")
+        return file_type
 
 
 class DocumentClassificationService:
     """Service for document type and classification logic."""
     
     @staticmethod
+    @lru_cache(maxsize=1024)
     def determine_document_type(filename: str) -> DocumentType:
         """Determine document type based on filename (placeholder logic)"""
-        filename_lower = filename.lower()
-        
-        if any(keyword in filename_lower for keyword in ['invoice', 'bill', 'inv']):
+        if _INVOICE_KEYWORDS_RE.search(filename):
             return DocumentType.INVOICE
-        elif any(keyword in filename_lower for keyword in ['receipt', 'rec']):
+        elif _RECEIPT_KEYWORDS_RE.search(filename):
             return DocumentType.RECEIPT
         else:
             # Default to invoice if we can't determine
@@ -105,13 +202,8 @@ class DocumentClassificationService:
         - INVOICE → REVENUE 
         - RECEIPT → EXPENSE
         """
-        if document_type == DocumentType.INVOICE:
-            return DocumentClassification.REVENUE
-        elif document_type == DocumentType.RECEIPT:
-            return DocumentClassification.EXPENSE
-        else:
-            # Default to EXPENSE if unknown type
-            return DocumentClassification.EXPENSE
+        # Default to EXPENSE if unknown type
+        return _DOCUMENT_TYPE_CLASSIFICATIONS.get(document_type, DocumentClassification.EXPENSE)
 
 
 class DocumentProcessingService:
@@ -120,10 +212,10 @@ class DocumentProcessingService:
     @staticmethod
     async def process_single_file(
         file: UploadFile, 
-        user: models.User, 
-        db: Session
+        user: models.User
     ) -> DocumentUploadResult:
-        """Process a single file upload"""
+        """Validate a single file, spool it and queue it for upload"""
+        file_size = 0
         try:
             # Basic validation
             if not file.filename:
@@ -134,8 +226,8 @@ class DocumentProcessingService:
                 )
             
             # Validate file size
-            file_size = FileValidationService.get_file_size(file)
-            if not FileValidationService.validate_file_size(file):
+            file_size, within_limit = FileValidationService.validate_file_size(file)
+            if not within_limit:
                 return DocumentUploadResult(
                     success=False,
                     filename=file.filename,
@@ -153,45 +245,33 @@ class DocumentProcessingService:
                     file_size=file_size
                 )
             
-            # Upload to Azure Blob Storage
-            blob_url = await azure_service.upload_file(file, user.id)
-            
             # Determine file and document types
             file_type = FileValidationService.get_file_type_from_filename(file.filename)
             document_type = DocumentClassificationService.determine_document_type(file.filename)
             classification = DocumentClassificationService.determine_document_classification(document_type)
             
-            # Create document record in database with PENDING status
-            document = models.Document(
-                user_id=user.id,
-                business_id=user.business_id,
-                filename=file.filename,
-                file_url=blob_url,
-                file_type=file_type,
-                document_type=document_type,
-                classification=classification,
-                status=DocumentStatus.PENDING
-            )
+            # The id is assigned up front so the client can track the document
+            # before the worker creates its record
+            document_id = uuid4()
             
-            db.add(document)
-            db.commit()
-            db.refresh(document)
+            # Spooling and broker publish block, so they run in a worker thread
+            task_id = await anyio.to_thread.run_sync(partial(
+                DocumentProcessingService._spool_and_dispatch,
+                file,
+                document_id,
+                user,
+                file_type,
+                document_type,
+                classification
+            ))
             
-            # Dispatch OCR processing task and update status to PROCESSING
-            task_id = dispatch_ocr_task(document.id)
-            
-            # Update status to PROCESSING after successful task dispatch
-            document.status = DocumentStatus.PROCESSING
-            db.commit()
-            
-            logger.info(f"Document {document.id} queued for processing with task ID: {task_id}")
-            logger.info(f"Successfully uploaded document {document.id} for user {user.id}")
+            logger.info("Queued upload of document %s for user %s as task %s", document_id, user.id, task_id)
             
             return DocumentUploadResult(
                 success=True,
                 filename=file.filename,
-                document_id=document.id,
-                blob_url=blob_url,
+                document_id=document_id,
+                task_id=task_id,
                 file_size=file_size,
                 file_type=file_type
             )
@@ -202,13 +282,193 @@ class DocumentProcessingService:
                 success=False,
                 filename=file.filename or "unknown",
                 error_message=f"Upload failed: {str(e)}",
-                file_size=FileValidationService.get_file_size(file) if file else 0
+                file_size=file_size
+            )
+    
+    @staticmethod
+    def _spool_and_dispatch(
+        file: UploadFile,
+        document_id: UUID,
+        user: models.User,
+        file_type: FileType,
+        document_type: DocumentType,
+        classification: DocumentClassification
+    ) -> str:
+        """Copy an upload into the shared spool directory and dispatch its upload task"""
+        spool_dir = get_settings().upload_spool_dir
+        os.makedirs(spool_dir, exist_ok=True)
+        spool_path = os.path.join(spool_dir, f"{document_id}.{file_type.value.lower()}")
+        
+        file.file.seek(0)
+        with open(spool_path, "wb") as spool_file:
+            shutil.copyfileobj(file.file, spool_file)
+        
+        try:
+            return dispatch_upload_task(
+                spool_path,
+                document_id,
+                user.id,
+                user.business_id,
+                file.filename,
+                file.content_type,
+                file_type,
+                document_type,
+                classification
+            )
+        except Exception:
+            os.remove(spool_path)
+            raise
+    
+    @staticmethod
+    async def process_files(
+        files: List[UploadFile],
+        user: models.User
+    ) -> List[DocumentUploadResult]:
+        """
+        Validate and queue a batch of uploads for the upload workers.
+        
+        Files are spooled to the directory shared with the Celery workers, which
+        upload them to blob storage, create the document records and dispatch
+        OCR, so the request only pays for a local copy per file.
+        """
+        return list(await asyncio.gather(
+            *(DocumentProcessingService.process_single_file(file, user) for file in files)
+        ))
+    
+    @staticmethod
+    def get_upload_status(task_id: str, business_id: int) -> UploadTaskStatusResponse:
+        """
+        Report the state of a queued upload.
+        
+        Task ids are only known to the uploader, but a finished task's result
+        names its business, so results for other businesses are reported as
+        not found.
+        """
+        result = celery_app.AsyncResult(task_id)
+        state = result.state
+        
+        if state == "SUCCESS":
+            payload = result.result or {}
+            if payload.get("business_id") != business_id:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Upload not found or access denied"
+                )
+            return UploadTaskStatusResponse(
+                task_id=task_id,
+                state=state,
+                document_id=payload.get("document_id"),
+                blob_url=payload.get("blob_url")
+            )
+        
+        if state == "FAILURE":
+            return UploadTaskStatusResponse(
+                task_id=task_id,
+                state=state,
+                error_message="Upload failed"
             )
+        
+        return UploadTaskStatusResponse(task_id=task_id, state=state)
+
+
+def encode_document_cursor(document: models.Document) -> str:
+    """Encode a document's (created_at, id) sort key as an opaque listing cursor."""
+    raw = f"{document.created_at.isoformat()}|{document.id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_document_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode a listing cursor back into its (created_at, id) sort key."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, document_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(document_id)
+    except (ValueError, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor."
+        )
 
 
 class DocumentQueryService:
     """Service for document querying and listing operations."""
     
+    @staticmethod
+    def get_business_document(
+        db: Session,
+        document_id: UUID,
+        business_id: int,
+        lock: bool = False
+    ) -> Optional[models.Document]:
+        """
+        Fetch a document by id, scoped to the owning business.
+        
+        Looks the primary key up through Session.get, so a document already in
+        the session's identity map is returned without issuing a SELECT; the
+        business check is applied to the loaded instance.
+        
+        With lock=True the row is always re-read with SELECT ... FOR NO KEY UPDATE,
+        serializing concurrent writers on the document until the transaction ends
+        without blocking inserts of child rows that reference it.
+        """
+        document = db.get(
+            models.Document,
+            document_id,
+            with_for_update={"key_share": True} if lock else None
+        )
+        if document is None or document.business_id != business_id:
+            return None
+        return document
+    
+    @staticmethod
+    def get_business_document_with_details(
+        db: Session,
+        document_id: UUID,
+        business_id: int
+    ) -> Optional[models.Document]:
+        """
+        Fetch a document with its extracted fields and line items loaded.
+        
+        Only COMPLETED documents have extraction results to show, so the child
+        queries are skipped for anything else (the common case while clients
+        poll a document through OCR) and both collections are set empty.
+        """
+        document = db.execute(
+            select(models.Document).where(
+                models.Document.id == document_id,
+                models.Document.business_id == business_id
+            ).options(
+                load_only(*DOCUMENT_RESPONSE_COLUMNS, models.Document.corrections_count)
+            ).limit(1)
+        ).scalars().first()
+        if document is None:
+            return None
+        
+        extracted_fields = []
+        line_items = []
+        if document.status == DocumentStatus.COMPLETED:
+            extracted_fields = db.execute(
+                select(models.ExtractedField).where(
+                    models.ExtractedField.document_id == document_id,
+                    models.ExtractedField.business_id == business_id
+                ).options(
+                    load_only(*EXTRACTED_FIELD_RESPONSE_COLUMNS)
+                ).order_by(models.ExtractedField.field_name)
+            ).scalars().all()
+            line_items = db.execute(
+                select(models.LineItem).where(
+                    models.LineItem.document_id == document_id,
+                    models.LineItem.business_id == business_id
+                ).options(
+                    load_only(*LINE_ITEM_RESPONSE_COLUMNS)
+                ).order_by(models.LineItem.id)
+            ).scalars().all()
+        
+        # Populate the relationships as loaded so later access never lazy-loads
+        set_committed_value(document, "extracted_fields", extracted_fields)
+        set_committed_value(document, "line_items", line_items)
+        return document
+    
     @staticmethod
     def list_business_documents(
         db: Session,
@@ -221,7 +481,9 @@ class DocumentQueryService:
         is_reviewed: Optional[bool] = None,
         client_id: Optional[int] = None,
         project_id: Optional[int] = None,
-        category_id: Optional[int] = None
+        category_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = False
     ) -> DocumentListResponse:
         """
         List all documents for a business with filters and pagination.
@@ -238,15 +500,30 @@ class DocumentQueryService:
             client_id: Optional client ID filter (validates business ownership)
             project_id: Optional project ID filter (validates business ownership)  
             category_id: Optional category ID filter (global scope)
+            cursor: Opaque next_cursor from a previous page; switches to keyset
+                pagination and takes precedence over page
+            include_total: Also count matching documents when paging by cursor
             
         Returns:
             DocumentListResponse with paginated documents
             
         Raises:
-            HTTPException: If client_id or project_id don't belong to the business
+            HTTPException: If client_id or project_id don't belong to the business,
+                or the cursor is malformed
         """
+        cache_key = (
+            business_id, page, per_page, status, document_type, classification,
+            is_reviewed, client_id, project_id, category_id, cursor, include_total
+        )
+        with _document_list_cache_lock:
+            cached = _document_list_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         # Base query for business documents
-        query = db.query(models.Document).filter(models.Document.business_id == business_id)
+        query = db.query(models.Document).options(
+            load_only(*DOCUMENT_RESPONSE_COLUMNS)
+        ).filter(models.Document.business_id == business_id)
         
         # Apply filters
         if status:
@@ -312,15 +589,33 @@ class DocumentQueryService:
                 
             query = query.filter(models.Document.category_id == category_id)
         
-        # Count total items for pagination
-        total_items = query.count()
-        
-        # Calculate pagination
-        total_pages = math.ceil(total_items / per_page) if total_items > 0 else 0
-        offset = (page - 1) * per_page
+        # Newest first; id breaks created_at ties so the keyset order is total
+        ordering = (models.Document.created_at.desc(), models.Document.id.desc())
         
-        # Apply pagination and ordering (newest first)
-        documents = query.order_by(models.Document.created_at.desc()).offset(offset).limit(per_page).all()
+        if cursor is not None:
+            # Keyset pagination: seek past the last row of the previous page on the
+            # (business_id, created_at, id) index instead of counting and skipping rows
+            cursor_created_at, cursor_id = decode_document_cursor(cursor)
+            total_items = query.count() if include_total else None
+            documents = query.filter(
+                tuple_(models.Document.created_at, models.Document.id) < (cursor_created_at, cursor_id)
+            ).order_by(*ordering).limit(per_page + 1).all()
+            has_next = len(documents) > per_page
+            documents = documents[:per_page]
+            total_pages = -(-total_items // per_page) if total_items is not None else None
+            has_prev = True
+        else:
+            # Count total items for pagination
+            total_items = query.count()
+            
+            # Calculate pagination
+            total_pages = -(-total_items // per_page)
+            offset = (page - 1) * per_page
+            
+            # Apply pagination and ordering (newest first)
+            documents = query.order_by(*ordering).offset(offset).limit(per_page).all()
+            has_next = offset + len(documents) < total_items
+            has_prev = page > 1
         
         # Create pagination metadata
         pagination = PaginationMeta(
@@ -328,37 +623,29 @@ class DocumentQueryService:
             per_page=per_page,
             total_items=total_items,
             total_pages=total_pages,
-            has_next=page < total_pages,
-            has_prev=page > 1
+            has_next=has_next,
+            has_prev=has_prev,
+            next_cursor=encode_document_cursor(documents[-1]) if has_next and documents else None
         )
         
         # Convert to response format
         document_responses = [
-            DocumentResponse(
-                id=doc.id,
-                filename=doc.filename,
-                file_type=doc.file_type,
-                document_type=doc.document_type,
-                status=doc.status,
-                user_id=doc.user_id,
-                business_id=doc.business_id,
-                file_url=doc.file_url,
-                confidence_score=doc.confidence_score,
-                reviewed_at=doc.reviewed_at,
-                reviewed_by=doc.reviewed_by,
-                is_reviewed=doc.reviewed_at is not None,
-                created_at=doc.created_at,
-                updated_at=doc.updated_at
-            )
+            build_document_response(doc)
             for doc in documents
         ]
         
-        logger.info(f"Retrieved {len(documents)} documents for business {business_id} (page {page}/{total_pages})")
+        logger.info(
+            f"Retrieved {len(documents)} documents for business {business_id} "
+            f"({'cursor' if cursor is not None else f'page {page}/{total_pages}'})"
+        )
         
-        return DocumentListResponse(
+        response = DocumentListResponse(
             documents=document_responses,
             pagination=pagination
         )
+        with _document_list_cache_lock:
+            _document_list_cache[cache_key] = response
+        return response
 
 
 class DocumentManagementService:
@@ -386,50 +673,151 @@ class DocumentManagementService:
         Raises:
             HTTPException: If document not found or invalid status
         """
-        # Validate user has access to document
-        document = db.query(models.Document).filter(
-            models.Document.id == document_id,
-            models.Document.business_id == business_id
-        ).first()
-        
-        if not document:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Document not found or access denied"
-            )
-        
-        # Validate document is in COMPLETED state
-        if document.status != DocumentStatus.COMPLETED:
+        # Access check, state check and write in one statement. The timestamp is
+        # taken once here and written to both columns, so the response reports
+        # exactly what was stored without reading it back. A repeat click by the
+        # same reviewer inside the idempotency window matches nothing here and is
+        # answered from the existing values below.
+        reviewed_at = datetime.now(timezone.utc)
+        recent_cutoff = reviewed_at - REVIEW_IDEMPOTENCY_WINDOW
+        try:
+            reviewed = db.execute(
+                update(models.Document)
+                .where(
+                    models.Document.id == document_id,
+                    models.Document.business_id == business_id,
+                    models.Document.status == DocumentStatus.COMPLETED,
+                    or_(
+                        models.Document.reviewed_by.is_distinct_from(user_id),
+                        models.Document.reviewed_at.is_(None),
+                        models.Document.reviewed_at <= recent_cutoff
+                    )
+                )
+                .values(reviewed_at=reviewed_at, reviewed_by=user_id, updated_at=reviewed_at),
+                execution_options={"synchronize_session": False}
+            ).rowcount > 0
+            if reviewed:
+                db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Failed to mark document {document_id} as reviewed: {str(e)}")
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Cannot mark document in {document.status.value} status as reviewed. Document must be COMPLETED."
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to mark document as reviewed"
             )
         
-        try:
-            # Mark document as reviewed
-            review_timestamp = func.now()
-            document.reviewed_at = review_timestamp
-            document.reviewed_by = user_id
-            document.updated_at = review_timestamp
+        if not reviewed:
+            # Nothing matched: tell a missing document apart from one not yet
+            # COMPLETED or one this user has just reviewed
+            current = db.execute(
+                select(
+                    models.Document.status,
+                    models.Document.reviewed_at,
+                    models.Document.reviewed_by
+                ).where(
+                    models.Document.id == document_id,
+                    models.Document.business_id == business_id
+                )
+            ).first()
             
-            # Commit the changes
-            db.commit()
-            db.refresh(document)
+            if current is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Document not found or access denied"
+                )
             
-            logger.info(f"Document {document_id} marked as reviewed by user {user_id}")
+            if current.status != DocumentStatus.COMPLETED:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Cannot mark document in {current.status.value} status as reviewed. Document must be COMPLETED."
+                )
             
             return MarkReviewedResponse(
                 success=True,
-                message="Document marked as reviewed successfully",
+                message="Document already marked as reviewed",
                 document_id=document_id,
-                reviewed_at=document.reviewed_at,
-                reviewed_by=document.reviewed_by
+                reviewed_at=current.reviewed_at,
+                reviewed_by=current.reviewed_by
             )
+        
+        invalidate_document_list_cache(business_id)
+        logger.info("Document %s marked as reviewed by user %s", document_id, user_id)
+        
+        return MarkReviewedResponse(
+            success=True,
+            message="Document marked as reviewed successfully",
+            document_id=document_id,
+            reviewed_at=reviewed_at,
+            reviewed_by=user_id
+        )
+    
+    @staticmethod
+    def mark_documents_reviewed(
+        db: Session,
+        document_ids: List[UUID],
+        user_id: int,
+        business_id: int
+    ) -> BulkMarkReviewedResponse:
+        """
+        Mark several documents as reviewed by the current user in one UPDATE.
+        
+        Documents that are missing, belong to another business, or are not
+        COMPLETED are left untouched and reported back as skipped.
+        
+        Args:
+            db: Database session
+            document_ids: Document UUIDs to mark as reviewed
+            user_id: Current user ID
+            business_id: Current user's business ID
             
-        except Exception as e:
+        Returns:
+            BulkMarkReviewedResponse listing reviewed and skipped documents
+            
+        Raises:
+            HTTPException: If the update fails
+        """
+        requested_ids = list(dict.fromkeys(document_ids))
+        reviewed_at = datetime.now(timezone.utc)
+        
+        try:
+            reviewed_ids = db.execute(
+                update(models.Document)
+                .where(
+                    models.Document.id.in_(requested_ids),
+                    models.Document.business_id == business_id,
+                    models.Document.status == DocumentStatus.COMPLETED
+                )
+                .values(reviewed_at=reviewed_at, reviewed_by=user_id, updated_at=reviewed_at)
+                .returning(models.Document.id),
+                execution_options={"synchronize_session": False}
+            ).scalars().all()
+            if reviewed_ids:
+                db.commit()
+        except SQLAlchemyError as e:
             db.rollback()
-            logger.error(f"Failed to mark document {document_id} as reviewed: {str(e)}")
+            logger.error(f"Failed to mark {len(requested_ids)} documents as reviewed: {str(e)}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to mark document as reviewed"
-            )
\ No newline at end of file
+                detail="Failed to mark documents as reviewed"
+            )
+        
+        reviewed_id_set = set(reviewed_ids)
+        skipped_ids = [doc_id for doc_id in requested_ids if doc_id not in reviewed_id_set]
+        
+        if reviewed_ids:
+            invalidate_document_list_cache(business_id)
+        logger.info(
+            "%d documents marked as reviewed by user %s, %d skipped",
+            len(reviewed_ids), user_id, len(skipped_ids)
+        )
+        
+        return BulkMarkReviewedResponse(
+            success=True,
+            message=f"{len(reviewed_ids)} documents marked as reviewed, {len(skipped_ids)} skipped",
+            reviewed_by=user_id,
+            reviewed=[
+                ReviewedDocument(document_id=doc_id, reviewed_at=reviewed_at)
+                for doc_id in requested_ids if doc_id in reviewed_id_set
+            ],
+            skipped_ids=skipped_ids
+        )
\ No newline at end of file
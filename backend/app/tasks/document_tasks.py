@@ -1,18 +1,32 @@
+import os
 import uuid
 import logging
 import asyncio
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from decimal import Decimal
+from azure.core.exceptions import AzureError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import delete
 from sqlalchemy.orm import Session
 
 from app.core.celery import celery_app
 from app.dependencies import get_db
 from app.models import Document, ExtractedField, LineItem
-from app.enums import DocumentStatus, DocumentType
+from app.enums import DocumentStatus, DocumentType, FileType, DocumentClassification
+from app.services.blob import get_azure_blob_service
 from app.services.azure_form_recognizer import get_azure_form_recognizer_client, DocumentExtractionError
 
 logger = logging.getLogger(__name__)
 
+# Broker publish retries with a growing interval (1s, 3s, 5s, ... capped at 30s)
+# so a briefly unavailable Redis doesn't fail the upload or get hammered.
+DISPATCH_RETRY_POLICY = {
+    "max_retries": 3,
+    "interval_start": 1,
+    "interval_step": 2,
+    "interval_max": 30,
+}
+
 
 @celery_app.task(bind=True)
 def process_document_ocr(self, document_id: str) -> dict:
@@ -61,7 +75,9 @@ def process_document_ocr(self, document_id: str) -> dict:
         finally:
             loop.close()
         
-        # 3. Normalize and save extracted fields
+        # 3. Normalize and save extracted fields. A retry replaces whatever an earlier
+        # attempt wrote; the results only commit together with the status change below.
+        _clear_extraction_results(db, document)
         fields_saved = _save_extracted_fields(db, document, extraction_result["fields"])
         line_items_saved = _save_line_items(db, document, extraction_result["line_items"])
         
@@ -77,13 +93,12 @@ def process_document_ocr(self, document_id: str) -> dict:
         document.confidence_score = overall_confidence
         logger.info(f"After status update - Document {document_id} new status: {document.status}, confidence: {overall_confidence}")
         
+        # Read before commit, which expires the instance and would force a reload
+        document_type = document.document_type
+        
         try:
             db.commit()
             logger.info(f"Database commit successful for document {document_id}")
-            
-            # Verify the update was persisted
-            db.refresh(document)
-            logger.info(f"After refresh - Document {document_id} status in DB: {document.status}")
         except Exception as commit_error:
             logger.error(f"Database commit failed for document {document_id}: {commit_error}")
             db.rollback()
@@ -95,7 +110,7 @@ def process_document_ocr(self, document_id: str) -> dict:
             "fields_extracted": fields_saved,
             "line_items_extracted": line_items_saved,
             "overall_confidence": overall_confidence,
-            "document_type": document.document_type.value
+            "document_type": document_type.value
         }
         
         logger.info(f"OCR processing completed for document {document_id}: "
@@ -111,6 +126,9 @@ def process_document_ocr(self, document_id: str) -> dict:
         
     except Exception as exc:
         logger.error(f"OCR processing failed for document {document_id}: {exc}")
+        if db:
+            # Discard partial OCR results so they are not committed with the FAILED status
+            db.rollback()
         _update_document_status_failed(db, document_id, str(exc))
         raise self.retry(exc=exc, countdown=60, max_retries=3)
         
@@ -119,6 +137,131 @@ def process_document_ocr(self, document_id: str) -> dict:
             db.close()
 
 
+# Storage and database errors while registering an upload are usually transient;
+# they are retried with jittered exponential backoff since the client was already
+# told the upload was accepted.
+UPLOAD_RETRY_EXCEPTIONS = (AzureError, SQLAlchemyError)
+
+
+@celery_app.task(
+    bind=True,
+    autoretry_for=UPLOAD_RETRY_EXCEPTIONS,
+    max_retries=5,
+    retry_backoff=2,
+    retry_backoff_max=300
+)
+def upload_and_register_document(
+    self,
+    spool_path: str,
+    document_id: str,
+    user_id: int,
+    business_id: int,
+    filename: str,
+    content_type: Optional[str],
+    file_type: str,
+    document_type: str,
+    classification: str
+) -> dict:
+    """
+    Upload a spooled document to blob storage and register it for OCR
+    
+    This task:
+    1. Uploads the spooled file to Azure Blob Storage
+    2. Creates the document record as PROCESSING
+    3. Dispatches the OCR task, marking the document FAILED if that fails
+    4. Removes the spooled file
+    
+    Blob storage and database errors are retried. The spooled file is kept
+    for the retry and removed once the document is registered or the final
+    attempt fails. A retry of an already registered document is a no-op.
+    
+    Args:
+        spool_path: Path of the upload in the shared spool directory
+        document_id: UUID string assigned to the document by the API
+        user_id: ID of the uploading user
+        business_id: ID of the uploading user's business
+        filename: Original filename
+        content_type: MIME type sent by the client, if any
+        file_type: FileType value
+        document_type: DocumentType value
+        classification: DocumentClassification value
+        
+    Returns:
+        Dictionary with the registered document
+    """
+    db = None
+    try:
+        logger.info(f"Starting upload of {filename} as document {document_id}")
+        
+        db = next(get_db())
+        
+        # An earlier attempt may have registered the document and then failed
+        # afterwards (dispatch, spool cleanup, lost acknowledgement); re-inserting
+        # would only loop on the primary key
+        existing = db.get(Document, uuid.UUID(document_id))
+        if existing is not None:
+            logger.info(f"Document {document_id} is already registered, skipping upload")
+            _remove_spool_file(spool_path)
+            return {
+                "document_id": document_id,
+                "business_id": business_id,
+                "blob_url": existing.file_url,
+                "status": "registered"
+            }
+        
+        blob_url = get_azure_blob_service().upload_spooled_file(
+            spool_path, user_id, document_id, filename, content_type
+        )
+        
+        document = Document(
+            id=uuid.UUID(document_id),
+            user_id=user_id,
+            business_id=business_id,
+            filename=filename,
+            file_url=blob_url,
+            file_type=FileType(file_type),
+            document_type=DocumentType(document_type),
+            classification=DocumentClassification(classification),
+            status=DocumentStatus.PROCESSING
+        )
+        db.add(document)
+        try:
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        
+        try:
+            dispatch_ocr_task(document_id)
+        except Exception as exc:
+            logger.error(f"Failed to dispatch OCR for document {document_id}: {exc}")
+            _update_document_status_failed(db, document_id, str(exc))
+        
+        logger.info(f"Registered uploaded document {document_id} for business {business_id}")
+        
+        _remove_spool_file(spool_path)
+        
+        return {
+            "document_id": document_id,
+            "business_id": business_id,
+            "blob_url": blob_url,
+            "status": "registered"
+        }
+        
+    except Exception as exc:
+        # Keep the spooled file only while another attempt will use it
+        if isinstance(exc, UPLOAD_RETRY_EXCEPTIONS) and self.request.retries < self.max_retries:
+            logger.error(f"Upload failed for document {document_id} ({filename}), keeping {spool_path} for retry: {exc}")
+        else:
+            logger.error(f"Upload failed for document {document_id} ({filename}), giving up: {exc}")
+            _remove_spool_file(spool_path)
+        raise
+        
+    finally:
+        if db:
+            db.close()
+
+
 @celery_app.task(bind=True)
 def process_document_classification(self, document_id: str) -> dict:
     """
@@ -163,11 +306,53 @@ def dispatch_ocr_task(document_id: uuid.UUID) -> str:
     Returns:
         Task ID for tracking
     """
-    task = process_document_ocr.delay(str(document_id))
+    task = process_document_ocr.apply_async(
+        args=[str(document_id)], retry=True, retry_policy=DISPATCH_RETRY_POLICY
+    )
     logger.info(f"Dispatched OCR task {task.id} for document {document_id}")
     return task.id
 
 
+def dispatch_upload_task(
+    spool_path: str,
+    document_id: uuid.UUID,
+    user_id: int,
+    business_id: int,
+    filename: str,
+    content_type: Optional[str],
+    file_type: FileType,
+    document_type: DocumentType,
+    classification: DocumentClassification
+) -> str:
+    """
+    Dispatch a spooled upload to a Celery worker
+    
+    Args:
+        spool_path: Path of the upload in the shared spool directory
+        document_id: UUID assigned to the document
+        user_id: ID of the uploading user
+        business_id: ID of the uploading user's business
+        filename: Original filename
+        content_type: MIME type sent by the client, if any
+        file_type: Detected file type
+        document_type: Detected document type
+        classification: Detected classification
+        
+    Returns:
+        Task ID for tracking
+    """
+    task = upload_and_register_document.apply_async(
+        args=[
+            spool_path, str(document_id), user_id, business_id, filename, content_type,
+            file_type.value, document_type.value, classification.value
+        ],
+        retry=True,
+        retry_policy=DISPATCH_RETRY_POLICY
+    )
+    logger.info(f"Dispatched upload task {task.id} for document {document_id}")
+    return task.id
+
+
 def dispatch_classification_task(document_id: uuid.UUID) -> str:
     """
     Dispatch classification task to Celery worker
@@ -178,13 +363,38 @@ def dispatch_classification_task(document_id: uuid.UUID) -> str:
     Returns:
         Task ID for tracking
     """
-    task = process_document_classification.delay(str(document_id))
+    task = process_document_classification.apply_async(
+        args=[str(document_id)], retry=True, retry_policy=DISPATCH_RETRY_POLICY
+    )
     logger.info(f"Dispatched classification task {task.id} for document {document_id}")
     return task.id
 
 
+def _remove_spool_file(spool_path: str) -> None:
+    """Delete a spooled upload, ignoring one that is already gone"""
+    try:
+        os.remove(spool_path)
+    except FileNotFoundError:
+        pass
+
+
 # Helper functions for OCR processing
 
+def _clear_extraction_results(db: Session, document: Document) -> None:
+    """
+    Delete extracted fields and line items left by an earlier OCR attempt
+    
+    Args:
+        db: Database session
+        document: Document instance
+    """
+    for model in (ExtractedField, LineItem):
+        db.execute(
+            delete(model).where(model.document_id == document.id),
+            execution_options={"synchronize_session": False}
+        )
+
+
 def _save_extracted_fields(db: Session, document: Document, fields: List[Dict[str, Any]]) -> int:
     """
     Save extracted fields to database
@@ -220,7 +430,8 @@ def _save_extracted_fields(db: Session, document: Document, fields: List[Dict[st
             logger.warning(f"Failed to save field {field_data.get('field_name', 'unknown')}: {e}")
             continue
     
-    db.commit()
+    # Flushed only; the caller commits with the document status
+    db.flush()
     logger.info(f"Saved {fields_saved}/{len(fields)} extracted fields for document {document.id}")
     return fields_saved
 
@@ -264,7 +475,8 @@ def _save_line_items(db: Session, document: Document, line_items: List[Dict[str,
             logger.warning(f"Failed to save line item {item_data.get('description', 'unknown')}: {e}")
             continue
     
-    db.commit()
+    # Flushed only; the caller commits with the document status
+    db.flush()
     logger.info(f"Saved {items_saved}/{len(line_items)} line items for document {document.id}")
     return items_saved
 
@@ -7,6 +7,8 @@ from sqlalchemy.pool import StaticPool
 
 from app.main import app
 from app.db import Base, get_db  # adjust imports to your project
+from app.routers.tags import clear_categories_cache
+from app.services.document_service import clear_document_list_cache
 
 # One in-memory DB shared across threads (TestClient) via StaticPool
 engine = create_engine(
@@ -49,8 +51,12 @@ def _override_get_db(db_session):
     def _get_db():
         yield db_session
     app.dependency_overrides[get_db] = _get_db
+    clear_document_list_cache()
+    clear_categories_cache()
     yield
     app.dependency_overrides.clear()
+    clear_document_list_cache()
+    clear_categories_cache()
 
 @pytest.fixture
 def client():
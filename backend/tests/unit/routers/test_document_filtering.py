@@ -7,6 +7,7 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 from uuid import uuid4
+from datetime import datetime, timedelta
 
 from app.main import app
 from app import models
@@ -448,6 +449,41 @@ class TestFilterValidationAndEdgeCases:
         assert len(result["documents"]) == 2  # Per page limit
         assert result["pagination"]["total_pages"] == 2
 
+    def test_filter_with_cursor_pagination(self, client: TestClient, db_session, test_tags_and_documents, auth_headers):
+        """Test keyset cursors walk the same documents as page numbers"""
+        # Two documents share a timestamp so the id tie-break is exercised
+        for i, doc in enumerate(test_tags_and_documents["documents"]):
+            doc.created_at = datetime(2024, 1, 1) + timedelta(minutes=i // 2)
+        db_session.commit()
+        
+        first = client.get("/documents/?classification=REVENUE&per_page=2", headers=auth_headers).json()
+        assert first["pagination"]["has_next"] is True
+        cursor = first["pagination"]["next_cursor"]
+        assert cursor is not None
+        
+        response = client.get(f"/documents/?classification=REVENUE&per_page=2&cursor={cursor}", headers=auth_headers)
+        
+        assert response.status_code == 200
+        result = response.json()
+        
+        assert result["pagination"]["total_items"] is None  # Count skipped for cursor pages
+        assert result["pagination"]["has_next"] is False
+        assert result["pagination"]["next_cursor"] is None
+        
+        cursor_ids = [doc["id"] for doc in first["documents"] + result["documents"]]
+        all_ids = [
+            doc["id"] for doc in
+            client.get("/documents/?classification=REVENUE", headers=auth_headers).json()["documents"]
+        ]
+        assert cursor_ids == all_ids
+
+    def test_invalid_cursor(self, client: TestClient, test_tags_and_documents, auth_headers):
+        """Test malformed cursors are rejected"""
+        response = client.get("/documents/?cursor=not-a-cursor", headers=auth_headers)
+        
+        assert response.status_code == 400
+        assert "cursor" in response.json()["detail"]
+
     def test_business_isolation_with_filters(self, client: TestClient, db_session, test_tags_and_documents, other_business_and_user, auth_headers):
         """Test that filters don't leak data between businesses"""
         data = test_tags_and_documents
@@ -8,6 +8,7 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 from uuid import uuid4
+from datetime import datetime
 from decimal import Decimal
 import sys
 import os
@@ -21,7 +22,7 @@ sys.modules['azure.core.credentials'] = Mock()
 sys.modules['azure.core.exceptions'] = Mock()
 
 from app.main import app
-from app.models import Business, User, Document, ExtractedField, LineItem
+from app.models import Business, User, Document, ExtractedField, LineItem, FieldCorrection
 from app.enums import DocumentStatus, DocumentType, FileType, DocumentClassification
 from app.auth import create_access_token, get_password_hash
 from app.db import get_db, Base
@@ -54,6 +55,7 @@ def db_session():
         yield db
     finally:
         # Clean up test data
+        db.query(FieldCorrection).delete()
         db.query(LineItem).delete()
         db.query(ExtractedField).delete()  
         db.query(Document).delete()
@@ -514,4 +516,220 @@ class TestGetDocumentFields:
         response = client.get("/documents/invalid-uuid/fields", headers=headers)
         
         # Should return 422 for validation error
-        assert response.status_code == 422
\ No newline at end of file
+        assert response.status_code == 422
+
+
+class TestCorrectDocumentFields:
+    """Test POST /documents/{id}/fields/correct endpoint"""
+    
+    def _create_completed_document(self, db_session, test_user):
+        document = Document(
+            user_id=test_user.id,
+            business_id=test_user.business_id,
+            filename="test_invoice.pdf",
+            file_url="https://example.com/test_invoice.pdf",
+            file_type=FileType.PDF,
+            document_type=DocumentType.INVOICE,
+            classification=DocumentClassification.EXPENSE,
+            status=DocumentStatus.COMPLETED,
+            confidence_score=0.9
+        )
+        db_session.add(document)
+        db_session.commit()
+        db_session.refresh(document)
+        
+        db_session.add(ExtractedField(
+            document_id=document.id,
+            business_id=test_user.business_id,
+            field_name="vendor_name",
+            value="ACME Crop",
+            confidence=0.55
+        ))
+        db_session.commit()
+        return document
+    
+    def test_correct_existing_and_new_fields(self, db_session: Session, test_user_and_token):
+        """Test corrections update existing fields, create missing ones and log each change"""
+        test_user, token = test_user_and_token
+        document = self._create_completed_document(db_session, test_user)
+        headers = {"Authorization": f"Bearer {token}"}
+        
+        response = client.post(
+            f"/documents/{document.id}/fields/correct",
+            json={"corrections": [
+                {"field_name": "vendor_name", "corrected_value": "ACME Corp"},
+                {"field_name": "invoice_number", "corrected_value": "INV-42"},
+                {"field_name": "vendor_name", "corrected_value": "ACME Corporation"}
+            ]},
+            headers=headers
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["corrections_applied"] == 3
+        assert data["corrections_failed"] == 0
+        
+        results = data["results"]
+        assert results[0]["original_value"] == "ACME Crop"
+        assert results[0]["was_new_field"] is False
+        assert results[1]["original_value"] is None
+        assert results[1]["was_new_field"] is True
+        assert results[2]["original_value"] == "ACME Corp"
+        
+        fields = {f["field_name"]: f for f in data["updated_fields"]}
+        assert set(fields) == {"invoice_number", "vendor_name"}
+        assert fields["vendor_name"]["updated_at"] is not None
+        assert fields["vendor_name"]["value"] == "ACME Corporation"
+        assert fields["vendor_name"]["confidence"] == 0.55  # OCR confidence survives the upsert
+        assert fields["invoice_number"]["value"] == "INV-42"
+        assert fields["invoice_number"]["confidence"] is None
+        
+        # The last correction in the request wins on the stored field
+        db_session.expire_all()
+        stored = db_session.query(ExtractedField).filter(
+            ExtractedField.document_id == document.id,
+            ExtractedField.field_name == "vendor_name"
+        ).one()
+        assert stored.value == "ACME Corporation"
+        
+        logged = db_session.query(FieldCorrection).filter(
+            FieldCorrection.document_id == document.id
+        ).count()
+        assert logged == 3
+        assert db_session.get(Document, document.id).corrections_count == 3
+    
+    def test_correct_fields_requires_completed_document(self, db_session: Session, test_user_and_token):
+        """Test corrections are rejected for documents that are not COMPLETED"""
+        test_user, token = test_user_and_token
+        document = self._create_completed_document(db_session, test_user)
+        document.status = DocumentStatus.PROCESSING
+        db_session.commit()
+        headers = {"Authorization": f"Bearer {token}"}
+        
+        response = client.post(
+            f"/documents/{document.id}/fields/correct",
+            json={"corrections": [{"field_name": "vendor_name", "corrected_value": "ACME Corp"}]},
+            headers=headers
+        )
+        
+        assert response.status_code == 400
+
+    def test_fields_overlay_uses_latest_correction(self, db_session: Session, test_user_and_token):
+        """Test the fields endpoint overlays only the most recent correction per field"""
+        from datetime import datetime, timezone
+        test_user, token = test_user_and_token
+        document = self._create_completed_document(db_session, test_user)
+        for value, ts in [("First", datetime(2024, 1, 1, tzinfo=timezone.utc)),
+                          ("Latest", datetime(2024, 3, 1, tzinfo=timezone.utc)),
+                          ("Middle", datetime(2024, 2, 1, tzinfo=timezone.utc))]:
+            db_session.add(FieldCorrection(
+                document_id=document.id,
+                business_id=test_user.business_id,
+                field_name="vendor_name",
+                original_value="ACME Crop",
+                corrected_value=value,
+                corrected_by=test_user.id,
+                timestamp=ts
+            ))
+        document.corrections_count = 3
+        db_session.commit()
+        headers = {"Authorization": f"Bearer {token}"}
+        
+        response = client.get(f"/documents/{document.id}/fields", headers=headers)
+        
+        assert response.status_code == 200
+        fields = response.json()["extracted_fields"]
+        assert len(fields) == 1
+        assert fields[0]["corrected_value"] == "Latest"
+        assert fields[0]["is_corrected"] is True
+
+
+class TestMarkDocumentReviewed:
+    """Test the mark-reviewed endpoint"""
+
+    def _create_document(self, db_session, test_user, status):
+        document = Document(
+            user_id=test_user.id,
+            business_id=test_user.business_id,
+            filename="test_invoice.pdf",
+            file_url="https://example.com/test_invoice.pdf",
+            file_type=FileType.PDF,
+            document_type=DocumentType.INVOICE,
+            classification=DocumentClassification.REVENUE,
+            status=status
+        )
+        db_session.add(document)
+        db_session.commit()
+        return document.id
+
+    def test_mark_reviewed_sets_reviewer(self, db_session: Session, test_user_and_token):
+        """Test a completed document is marked reviewed in one update"""
+        test_user, token = test_user_and_token
+        user_id = test_user.id
+        document_id = self._create_document(db_session, test_user, DocumentStatus.COMPLETED)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        response = client.post(f"/documents/{document_id}/mark-reviewed", headers=headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["reviewed_by"] == user_id
+        assert data["reviewed_at"] is not None
+        db_session.expire_all()
+        assert db_session.get(Document, document_id).reviewed_by == user_id
+
+    def test_mark_reviewed_repeat_click_returns_existing_review(self, db_session: Session, test_user_and_token):
+        """Test a second click right after the first does not rewrite the review"""
+        test_user, token = test_user_and_token
+        document_id = self._create_document(db_session, test_user, DocumentStatus.COMPLETED)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        first = client.post(f"/documents/{document_id}/mark-reviewed", headers=headers)
+        second = client.post(f"/documents/{document_id}/mark-reviewed", headers=headers)
+
+        assert second.status_code == 200
+        assert second.json()["message"] == "Document already marked as reviewed"
+        # SQLite hands the stored timestamp back without its UTC offset
+        first_reviewed_at = datetime.fromisoformat(first.json()["reviewed_at"]).replace(tzinfo=None)
+        second_reviewed_at = datetime.fromisoformat(second.json()["reviewed_at"]).replace(tzinfo=None)
+        assert second_reviewed_at == first_reviewed_at
+
+    def test_mark_reviewed_rejects_unfinished_and_missing_documents(self, db_session: Session, test_user_and_token):
+        """Test pending documents get 400 and unknown ids get 404"""
+        test_user, token = test_user_and_token
+        document_id = self._create_document(db_session, test_user, DocumentStatus.PENDING)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        pending = client.post(f"/documents/{document_id}/mark-reviewed", headers=headers)
+        missing = client.post(f"/documents/{uuid4()}/mark-reviewed", headers=headers)
+
+        assert pending.status_code == 400
+        assert "PENDING" in pending.json()["detail"]
+        assert missing.status_code == 404
+
+    def test_bulk_mark_reviewed_reports_skipped_ids(self, db_session: Session, test_user_and_token):
+        """Test the bulk endpoint reviews completed documents and skips the rest"""
+        test_user, token = test_user_and_token
+        user_id = test_user.id
+        completed_ids = [
+            self._create_document(db_session, test_user, DocumentStatus.COMPLETED)
+            for _ in range(2)
+        ]
+        pending_id = self._create_document(db_session, test_user, DocumentStatus.PENDING)
+        missing_id = uuid4()
+        headers = {"Authorization": f"Bearer {token}"}
+
+        response = client.post(
+            "/documents/mark-reviewed",
+            json={"document_ids": [str(i) for i in [*completed_ids, pending_id, missing_id]]},
+            headers=headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["reviewed_by"] == user_id
+        assert [item["document_id"] for item in data["reviewed"]] == [str(i) for i in completed_ids]
+        assert data["skipped_ids"] == [str(pending_id), str(missing_id)]
+        db_session.expire_all()
+        assert all(db_session.get(Document, i).reviewed_by == user_id for i in completed_ids)
+        assert db_session.get(Document, pending_id).reviewed_by is None
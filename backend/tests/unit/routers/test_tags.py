@@ -409,6 +409,27 @@ class TestCategoryEndpoints:
         assert "Shared Category 1" in names1
         assert "Shared Category 2" in names1
 
+    def test_list_categories_etag_not_modified(self, client: TestClient, db_session, test_business_and_user, auth_headers):
+        """Test a matching If-None-Match gets 304 and the cached list is served without re-querying"""
+        db_session.add(models.Category(name="Office Supplies"))
+        db_session.commit()
+        
+        response = client.get("/categories", headers=auth_headers)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        
+        # Added within the cache window, so the cached list is still served
+        db_session.add(models.Category(name="Software"))
+        db_session.commit()
+        
+        cached = client.get("/categories", headers=auth_headers)
+        assert cached.headers["ETag"] == etag
+        assert [c["name"] for c in cached.json()] == ["Office Supplies"]
+        
+        not_modified = client.get("/categories", headers={**auth_headers, "If-None-Match": etag})
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+
     def test_list_categories_unauthorized(self, client: TestClient):
         """Test listing categories without authentication fails"""
         response = client.get("/categories")
@@ -20,31 +20,20 @@ class TestAuthService:
         """Test that check_user_exists returns True when user exists."""
         # Arrange
         mock_db = Mock(spec=Session)
-        mock_query = Mock()
-        mock_filter = Mock()
-        mock_user = Mock()  # User exists
-        
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_filter
-        mock_filter.first.return_value = mock_user
+        mock_db.scalar.return_value = True  # User exists
         
         # Act
         result = AuthService.check_user_exists(mock_db, "test@example.com")
         
         # Assert
         assert result is True
-        mock_db.query.assert_called_once()
+        mock_db.scalar.assert_called_once()
     
     def test_check_user_exists_returns_false_when_user_does_not_exist(self):
         """Test that check_user_exists returns False when user does not exist."""
         # Arrange
         mock_db = Mock(spec=Session)
-        mock_query = Mock()
-        mock_filter = Mock()
-        
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_filter
-        mock_filter.first.return_value = None  # User does not exist
+        mock_db.scalar.return_value = False  # User does not exist
         
         # Act
         result = AuthService.check_user_exists(mock_db, "test@example.com")
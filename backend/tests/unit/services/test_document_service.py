@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException, UploadFile
 from uuid import UUID, uuid4
 from datetime import datetime
+import io
 import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -13,10 +14,13 @@ from app.services.document_service import (
     DocumentClassificationService,
     DocumentProcessingService,
     DocumentQueryService,
-    DocumentManagementService
+    DocumentManagementService,
+    build_document_response,
+    invalidate_document_list_cache
 )
 from app.enums import FileType, DocumentType, DocumentClassification, DocumentStatus
 from app.models import User, Document
+from app.schemas import DocumentUploadResult
 
 
 class TestFileValidationService:
@@ -31,10 +35,11 @@ class TestFileValidationService:
         mock_file.file.tell = Mock(side_effect=[0, 1024])  # current pos, file size
         
         # Act
-        result = FileValidationService.validate_file_size(mock_file)
+        file_size, within_limit = FileValidationService.validate_file_size(mock_file)
         
         # Assert
-        assert result is True
+        assert file_size == 1024
+        assert within_limit is True
     
     def test_validate_file_size_invalid_file(self):
         """Test file size validation fails for oversized file."""
@@ -45,10 +50,22 @@ class TestFileValidationService:
         mock_file.file.tell = Mock(side_effect=[0, 20*1024*1024])  # 20MB file
         
         # Act
-        result = FileValidationService.validate_file_size(mock_file)
+        file_size, within_limit = FileValidationService.validate_file_size(mock_file)
         
         # Assert
-        assert result is False
+        assert file_size == 20*1024*1024
+        assert within_limit is False
+    
+    def test_get_file_size_uses_parsed_size_without_seeking(self):
+        """Test the size recorded by Starlette's form parser is used directly."""
+        mock_file = Mock(spec=UploadFile)
+        mock_file.size = 2048
+        mock_file.file = Mock()
+        
+        result = FileValidationService.get_file_size(mock_file)
+        
+        assert result == 2048
+        mock_file.file.seek.assert_not_called()
     
     def test_get_file_type_from_filename_pdf(self):
         """Test getting file type for PDF files."""
@@ -67,7 +84,12 @@ class TestFileValidationService:
         """Test getting file type for PNG files."""
         result = FileValidationService.get_file_type_from_filename("image.png")
         assert result == FileType.PNG
-    
+
+    def test_get_file_type_from_filename_uppercase_extension(self):
+        """Test extension matching is case-insensitive and uses the last suffix."""
+        result = FileValidationService.get_file_type_from_filename("scan.2024.JPEG")
+        assert result == FileType.JPG
+
     def test_get_file_type_from_filename_unsupported(self):
         """Test getting file type for unsupported files raises error."""
         with pytest.raises(ValueError, match="Unsupported file extension"):
@@ -96,6 +118,11 @@ class TestDocumentClassificationService:
         result = DocumentClassificationService.determine_document_type("rec_002.pdf")
         assert result == DocumentType.RECEIPT
     
+    def test_determine_document_type_invoice_keywords_take_precedence(self):
+        """Test invoice keywords win over receipt keywords regardless of position or case."""
+        result = DocumentClassificationService.determine_document_type("RECEIPT_for_Invoice.PDF")
+        assert result == DocumentType.INVOICE
+
     def test_determine_document_type_default(self):
         """Test document type determination defaults to invoice."""
         result = DocumentClassificationService.determine_document_type("document.pdf")
@@ -122,43 +149,70 @@ class TestDocumentProcessingService:
     """Test cases for DocumentProcessingService."""
     
     @pytest.mark.asyncio
-    async def test_process_single_file_success(self):
-        """Test successful file processing."""
+    async def test_process_single_file_success(self, tmp_path):
+        """Test a valid file is spooled and queued for upload."""
         # Arrange
         mock_file = Mock(spec=UploadFile)
         mock_file.filename = "test_invoice.pdf"
+        mock_file.content_type = "application/pdf"
+        mock_file.file = io.BytesIO(b"%PDF-1.4 test")
         
         mock_user = Mock(spec=User)
         mock_user.id = 1
         mock_user.business_id = 1
         
-        mock_db = Mock(spec=Session)
-        mock_document = Mock(spec=Document)
-        mock_document.id = uuid4()
-        
-        with patch.object(FileValidationService, 'get_file_size', return_value=1024), \
-             patch.object(FileValidationService, 'validate_file_size', return_value=True), \
+        with patch.object(FileValidationService, 'validate_file_size', return_value=(1024, True)), \
              patch('app.services.document_service.get_azure_blob_service') as mock_blob_service, \
+             patch('app.services.document_service.get_settings') as mock_settings, \
              patch.object(FileValidationService, 'get_file_type_from_filename', return_value=FileType.PDF), \
              patch.object(DocumentClassificationService, 'determine_document_type', return_value=DocumentType.INVOICE), \
              patch.object(DocumentClassificationService, 'determine_document_classification', return_value=DocumentClassification.REVENUE), \
-             patch('app.services.document_service.dispatch_ocr_task', return_value="task_123"):
+             patch('app.services.document_service.dispatch_upload_task', return_value="task_123") as mock_dispatch:
             
             mock_blob_service.return_value.validate_file_type.return_value = True
-            mock_blob_service.return_value.upload_file = AsyncMock(return_value="https://blob.url/file")
-            
-            mock_db.add = Mock()
-            mock_db.commit = Mock()
-            mock_db.refresh = Mock()
+            mock_settings.return_value.upload_spool_dir = str(tmp_path)
             
             # Act
-            result = await DocumentProcessingService.process_single_file(mock_file, mock_user, mock_db)
+            result = await DocumentProcessingService.process_single_file(mock_file, mock_user)
             
             # Assert
             assert result.success is True
             assert result.filename == "test_invoice.pdf"
+            assert result.task_id == "task_123"
             assert result.file_size == 1024
             assert result.file_type == FileType.PDF
+            spool_path = mock_dispatch.call_args.args[0]
+            assert open(spool_path, "rb").read() == b"%PDF-1.4 test"
+            assert mock_dispatch.call_args.args[1] == result.document_id
+    
+    @pytest.mark.asyncio
+    async def test_process_single_file_dispatch_failure_removes_spool(self, tmp_path):
+        """Test a failed task dispatch reports the file failed and drops its spool copy."""
+        # Arrange
+        mock_file = Mock(spec=UploadFile)
+        mock_file.filename = "test_invoice.pdf"
+        mock_file.content_type = "application/pdf"
+        mock_file.file = io.BytesIO(b"%PDF-1.4 test")
+        
+        mock_user = Mock(spec=User)
+        mock_user.id = 1
+        mock_user.business_id = 1
+        
+        with patch.object(FileValidationService, 'validate_file_size', return_value=(1024, True)), \
+             patch('app.services.document_service.get_azure_blob_service') as mock_blob_service, \
+             patch('app.services.document_service.get_settings') as mock_settings, \
+             patch('app.services.document_service.dispatch_upload_task', side_effect=ConnectionError("broker unavailable")):
+            
+            mock_blob_service.return_value.validate_file_type.return_value = True
+            mock_settings.return_value.upload_spool_dir = str(tmp_path)
+            
+            # Act
+            result = await DocumentProcessingService.process_single_file(mock_file, mock_user)
+        
+        # Assert
+        assert result.success is False
+        assert "broker unavailable" in result.error_message
+        assert list(tmp_path.iterdir()) == []
     
     @pytest.mark.asyncio
     async def test_process_single_file_no_filename(self):
@@ -168,10 +222,9 @@ class TestDocumentProcessingService:
         mock_file.filename = None
         
         mock_user = Mock(spec=User)
-        mock_db = Mock(spec=Session)
         
         # Act
-        result = await DocumentProcessingService.process_single_file(mock_file, mock_user, mock_db)
+        result = await DocumentProcessingService.process_single_file(mock_file, mock_user)
         
         # Assert
         assert result.success is False
@@ -185,19 +238,60 @@ class TestDocumentProcessingService:
         mock_file.filename = "large_file.pdf"
         
         mock_user = Mock(spec=User)
-        mock_db = Mock(spec=Session)
         
-        with patch.object(FileValidationService, 'get_file_size', return_value=20*1024*1024), \
-             patch.object(FileValidationService, 'validate_file_size', return_value=False):
+        with patch.object(FileValidationService, 'validate_file_size', return_value=(20*1024*1024, False)):
             
             # Act
-            result = await DocumentProcessingService.process_single_file(mock_file, mock_user, mock_db)
+            result = await DocumentProcessingService.process_single_file(mock_file, mock_user)
             
             # Assert
             assert result.success is False
             assert "File size exceeds limit" in result.error_message
 
 
+    @pytest.mark.asyncio
+    async def test_process_files_queues_each_file(self):
+        """Test a batch of uploads is processed concurrently in request order."""
+        # Arrange
+        files = [Mock(spec=UploadFile), Mock(spec=UploadFile)]
+        files[0].filename = "invoice_a.pdf"
+        files[1].filename = "invoice_b.pdf"
+        mock_user = Mock(spec=User)
+        mock_user.id = 1
+        mock_user.business_id = 1
+        
+        async def fake_process(file, user):
+            return DocumentUploadResult(success=True, filename=file.filename, document_id=uuid4(), task_id="task")
+        
+        with patch.object(DocumentProcessingService, 'process_single_file', side_effect=fake_process):
+            # Act
+            results = await DocumentProcessingService.process_files(files, mock_user)
+        
+        # Assert
+        assert [r.filename for r in results] == ["invoice_a.pdf", "invoice_b.pdf"]
+        assert all(r.success for r in results)
+    
+    def test_get_upload_status_hides_other_business_results(self):
+        """Test finished uploads are only reported to the uploading business."""
+        # Arrange
+        document_id = uuid4()
+        with patch('app.services.document_service.celery_app') as mock_celery:
+            mock_celery.AsyncResult.return_value.state = "SUCCESS"
+            mock_celery.AsyncResult.return_value.result = {
+                "document_id": str(document_id), "business_id": 1, "blob_url": "https://blob.url/file"
+            }
+            
+            # Act
+            status = DocumentProcessingService.get_upload_status("task_123", business_id=1)
+            with pytest.raises(HTTPException) as exc_info:
+                DocumentProcessingService.get_upload_status("task_123", business_id=2)
+        
+        # Assert
+        assert status.state == "SUCCESS"
+        assert status.document_id == document_id
+        assert exc_info.value.status_code == 404
+
+
 class TestDocumentQueryService:
     """Test cases for DocumentQueryService."""
     
@@ -212,7 +306,7 @@ class TestDocumentQueryService:
         mock_limit = Mock()
         
         # Chain the query methods
-        mock_db.query.return_value = mock_query
+        mock_db.query.return_value.options.return_value = mock_query
         mock_query.filter.return_value = mock_filter
         mock_filter.count.return_value = 0
         mock_filter.order_by.return_value = mock_order_by
@@ -229,6 +323,53 @@ class TestDocumentQueryService:
         assert result.pagination.total_items == 0
 
 
+    def test_list_business_documents_served_from_cache_until_invalidated(self):
+        """Test repeat listings hit the cache and invalidation forces a re-query."""
+        # Arrange
+        mock_db = Mock(spec=Session)
+        mock_filter = mock_db.query.return_value.options.return_value.filter.return_value
+        mock_filter.count.return_value = 0
+        mock_filter.order_by.return_value.offset.return_value.limit.return_value.all.return_value = []
+        
+        # Act
+        first = DocumentQueryService.list_business_documents(mock_db, business_id=7)
+        second = DocumentQueryService.list_business_documents(mock_db, business_id=7)
+        invalidate_document_list_cache(7)
+        DocumentQueryService.list_business_documents(mock_db, business_id=7)
+        
+        # Assert
+        assert second is first
+        assert mock_filter.count.call_count == 2
+
+    def test_build_document_response_reused_until_row_changes(self):
+        """Test identical document rows share a response and updates rebuild it."""
+        # Arrange
+        document = Document(
+            id=uuid4(),
+            user_id=1,
+            business_id=1,
+            filename="invoice.pdf",
+            file_url="https://example.com/invoice.pdf",
+            file_type=FileType.PDF,
+            document_type=DocumentType.INVOICE,
+            status=DocumentStatus.COMPLETED,
+            created_at=datetime(2024, 1, 1)
+        )
+        
+        # Act
+        first = build_document_response(document)
+        second = build_document_response(document)
+        document.reviewed_at = datetime(2024, 1, 2)
+        document.updated_at = datetime(2024, 1, 2)
+        third = build_document_response(document)
+        
+        # Assert
+        assert second is first
+        assert first.is_reviewed is False
+        assert third is not first
+        assert third.is_reviewed is True
+
+
 class TestDocumentManagementService:
     """Test cases for DocumentManagementService."""
     
@@ -236,51 +377,31 @@ class TestDocumentManagementService:
         """Test successful document review marking."""
         # Arrange
         mock_db = Mock(spec=Session)
-        mock_document = Mock(spec=Document)
         document_id = uuid4()
-        mock_document.id = document_id
-        mock_document.status = DocumentStatus.COMPLETED
-        
-        # Set up datetime attributes that will be set during the operation
-        review_time = datetime.now()
-        mock_document.reviewed_at = review_time
-        mock_document.reviewed_by = 1
-        mock_document.updated_at = review_time
-        
-        mock_query = Mock()
-        mock_filter = Mock()
-        
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_filter
-        mock_filter.first.return_value = mock_document
+        mock_db.execute.return_value.rowcount = 1
         
         user_id = 1
         business_id = 1
         
-        # Mock SQLAlchemy func.now() to return actual datetime
-        with patch('app.services.document_service.func') as mock_func:
-            mock_func.now.return_value = review_time
-            
-            # Act
-            result = DocumentManagementService.mark_document_reviewed(
-                mock_db, document_id, user_id, business_id
-            )
-            
-            # Assert
-            assert result.success is True
-            assert result.document_id == document_id
-            mock_db.commit.assert_called_once()
+        # Act
+        result = DocumentManagementService.mark_document_reviewed(
+            mock_db, document_id, user_id, business_id
+        )
+        
+        # Assert
+        assert result.success is True
+        assert result.document_id == document_id
+        assert result.reviewed_at.tzinfo is not None
+        assert result.reviewed_by == 1
+        mock_db.execute.assert_called_once()
+        mock_db.commit.assert_called_once()
     
     def test_mark_document_reviewed_not_found(self):
         """Test document review marking fails when document not found."""
         # Arrange
         mock_db = Mock(spec=Session)
-        mock_query = Mock()
-        mock_filter = Mock()
-        
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_filter
-        mock_filter.first.return_value = None  # Document not found
+        mock_db.execute.return_value.rowcount = 0  # Nothing updated
+        mock_db.execute.return_value.first.return_value = None  # Document not found
         
         document_id = uuid4()
         user_id = 1
@@ -294,20 +415,16 @@ class TestDocumentManagementService:
         
         assert exc_info.value.status_code == 404
         assert "Document not found" in exc_info.value.detail
+        mock_db.commit.assert_not_called()
     
     def test_mark_document_reviewed_wrong_status(self):
         """Test document review marking fails for non-completed documents."""
         # Arrange
         mock_db = Mock(spec=Session)
-        mock_document = Mock(spec=Document)
-        mock_document.status = DocumentStatus.PENDING  # Not completed
-        
-        mock_query = Mock()
-        mock_filter = Mock()
-        
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_filter
-        mock_filter.first.return_value = mock_document
+        mock_db.execute.return_value.rowcount = 0  # Nothing updated
+        mock_db.execute.return_value.first.return_value = Mock(
+            status=DocumentStatus.PENDING, reviewed_at=None, reviewed_by=None
+        )  # Not completed
         
         document_id = uuid4()
         user_id = 1
@@ -320,4 +437,25 @@ class TestDocumentManagementService:
             )
         
         assert exc_info.value.status_code == 400
-        assert "Cannot mark document in" in exc_info.value.detail
\ No newline at end of file
+        assert "Cannot mark document in" in exc_info.value.detail
+
+    def test_mark_document_reviewed_recent_repeat_skips_write(self):
+        """Test a repeat review by the same user inside the window returns the existing values."""
+        # Arrange
+        mock_db = Mock(spec=Session)
+        review_time = datetime.now()
+        mock_db.execute.return_value.rowcount = 0  # Update skipped by the idempotency window
+        mock_db.execute.return_value.first.return_value = Mock(
+            status=DocumentStatus.COMPLETED, reviewed_at=review_time, reviewed_by=1
+        )
+        
+        document_id = uuid4()
+        
+        # Act
+        result = DocumentManagementService.mark_document_reviewed(mock_db, document_id, 1, 1)
+        
+        # Assert
+        assert result.success is True
+        assert result.reviewed_at == review_time
+        assert result.reviewed_by == 1
+        mock_db.commit.assert_not_called()
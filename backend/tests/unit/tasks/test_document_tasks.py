@@ -7,15 +7,21 @@ import uuid
 from unittest.mock import Mock, patch, AsyncMock
 from decimal import Decimal
 import sys
+from sqlalchemy.exc import SQLAlchemyError
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from app.tasks.document_tasks import (
     process_document_ocr, 
+    _clear_extraction_results,
     _save_extracted_fields, 
     _save_line_items, 
     _calculate_overall_confidence,
-    _update_document_status_failed
+    _update_document_status_failed,
+    dispatch_ocr_task,
+    upload_and_register_document,
+    DISPATCH_RETRY_POLICY,
+    UPLOAD_RETRY_EXCEPTIONS
 )
 from app.models import Document, ExtractedField, LineItem, User, Business
 from app.enums import DocumentStatus, DocumentType, FileType, DocumentClassification
@@ -257,6 +263,29 @@ class TestHelperFunctions:
         assert vendor_field.value == "Test Vendor"
         assert vendor_field.confidence == 0.95
     
+    def test_retried_extraction_replaces_previous_results(self, db_session, test_user_and_document):
+        """Test a retry rewrites fields and line items instead of hitting the unique index"""
+        user, document = test_user_and_document
+        
+        for value in ("First Vendor", "Second Vendor"):
+            _clear_extraction_results(db_session, document)
+            _save_extracted_fields(db_session, document, [
+                {"field_name": "vendor_name", "value": value, "confidence": 0.9}
+            ])
+            _save_line_items(db_session, document, [
+                {"description": value, "confidence": 0.9}
+            ])
+        
+        saved_fields = db_session.query(ExtractedField).filter(
+            ExtractedField.document_id == document.id
+        ).all()
+        saved_items = db_session.query(LineItem).filter(
+            LineItem.document_id == document.id
+        ).all()
+        
+        assert [f.value for f in saved_fields] == ["Second Vendor"]
+        assert [i.description for i in saved_items] == ["Second Vendor"]
+    
     def test_save_line_items(self, db_session, test_user_and_document):
         """Test saving line items to database"""
         user, document = test_user_and_document
@@ -338,6 +367,125 @@ class TestHelperFunctions:
         assert document.confidence_score == 0.0
 
 
+class TestUploadAndRegisterDocument:
+    """Test cases for upload_and_register_document Celery task"""
+    
+    @patch('app.tasks.document_tasks.dispatch_ocr_task')
+    @patch('app.tasks.document_tasks.get_azure_blob_service')
+    @patch('app.tasks.document_tasks.get_db')
+    def test_uploads_registers_and_dispatches(self, mock_get_db, mock_get_blob, mock_dispatch, db_session, tmp_path):
+        """Test the spooled file is uploaded, the document created and OCR dispatched"""
+        user = create_user_and_business(
+            db=db_session,
+            email="upload_task@example.com",
+            password="testpass123",
+            business_name="Upload Task Business"
+        )
+        user_id, business_id = user.id, user.business_id
+        spool_path = tmp_path / "spooled.pdf"
+        spool_path.write_bytes(b"%PDF-1.4")
+        document_id = str(uuid.uuid4())
+        mock_get_db.return_value = iter([db_session])
+        mock_get_blob.return_value.upload_spooled_file.return_value = "https://blob.url/invoice.pdf"
+        
+        result = upload_and_register_document(
+            str(spool_path), document_id, user_id, business_id, "invoice.pdf", "application/pdf",
+            "PDF", "INVOICE", "REVENUE"
+        )
+        
+        assert result["document_id"] == document_id
+        assert result["business_id"] == business_id
+        status, file_url, classification = db_session.query(
+            Document.status, Document.file_url, Document.classification
+        ).filter(Document.id == uuid.UUID(document_id)).one()
+        assert status == DocumentStatus.PROCESSING
+        assert file_url == "https://blob.url/invoice.pdf"
+        assert classification == DocumentClassification.REVENUE
+        mock_dispatch.assert_called_once_with(document_id)
+        mock_get_blob.return_value.upload_spooled_file.assert_called_once_with(
+            str(spool_path), user_id, document_id, "invoice.pdf", "application/pdf"
+        )
+        assert not spool_path.exists()
+    
+    @patch('app.tasks.document_tasks.dispatch_ocr_task')
+    @patch('app.tasks.document_tasks.get_azure_blob_service')
+    @patch('app.tasks.document_tasks.get_db')
+    def test_retry_of_registered_document_is_a_no_op(
+        self, mock_get_db, mock_get_blob, mock_dispatch, db_session, test_user_and_document, tmp_path
+    ):
+        """Test a retry after the document was committed skips the upload and insert"""
+        user, document = test_user_and_document
+        spool_path = tmp_path / "spooled.pdf"
+        spool_path.write_bytes(b"%PDF-1.4")
+        mock_get_db.return_value = iter([db_session])
+        
+        result = upload_and_register_document(
+            str(spool_path), str(document.id), user.id, user.business_id, "invoice.pdf", None,
+            "PDF", "INVOICE", "REVENUE"
+        )
+        
+        assert result["blob_url"] == "https://example.com/test_invoice_c3.pdf"
+        mock_get_blob.return_value.upload_spooled_file.assert_not_called()
+        mock_dispatch.assert_not_called()
+        assert not spool_path.exists()
+    
+    @patch('app.tasks.document_tasks.get_azure_blob_service')
+    @patch('app.tasks.document_tasks.get_db')
+    def test_upload_failure_keeps_spool_file_for_retry(self, mock_get_db, mock_get_blob, tmp_path):
+        """Test a retryable failure raises, uploads nothing and keeps the spool for the retry"""
+        spool_path = tmp_path / "spooled.pdf"
+        spool_path.write_bytes(b"%PDF-1.4")
+        mock_get_db.side_effect = SQLAlchemyError("database unavailable")
+        
+        with pytest.raises(SQLAlchemyError):
+            upload_and_register_document(
+                str(spool_path), str(uuid.uuid4()), 1, 1, "invoice.pdf", None, "PDF", "INVOICE", "REVENUE"
+            )
+        
+        mock_get_blob.return_value.upload_spooled_file.assert_not_called()
+        assert spool_path.exists()
+    
+    @patch('app.tasks.document_tasks.get_azure_blob_service')
+    @patch('app.tasks.document_tasks.get_db')
+    def test_final_attempt_failure_removes_spool_file(self, mock_get_db, mock_get_blob, tmp_path):
+        """Test the spool is removed once no retry is left to use it"""
+        spool_path = tmp_path / "spooled.pdf"
+        spool_path.write_bytes(b"%PDF-1.4")
+        mock_get_db.side_effect = SQLAlchemyError("database unavailable")
+        
+        # A direct call runs as attempt 0, which is the last one with no retries left
+        with patch.object(upload_and_register_document, 'max_retries', 0), \
+             pytest.raises(SQLAlchemyError):
+            upload_and_register_document(
+                str(spool_path), str(uuid.uuid4()), 1, 1, "invoice.pdf", None, "PDF", "INVOICE", "REVENUE"
+            )
+        
+        assert not spool_path.exists()
+    
+    def test_storage_and_database_errors_are_retried(self):
+        """Test transient blob and database errors trigger automatic retries"""
+        assert upload_and_register_document.autoretry_for == UPLOAD_RETRY_EXCEPTIONS
+        assert SQLAlchemyError in UPLOAD_RETRY_EXCEPTIONS
+        assert upload_and_register_document.max_retries > 0
+
+
+class TestDispatch:
+    """Test cases for task dispatch helpers"""
+    
+    @patch('app.tasks.document_tasks.process_document_ocr')
+    def test_dispatch_ocr_task_retries_broker_publish(self, mock_task):
+        """Test OCR dispatch publishes with the bounded backoff retry policy"""
+        mock_task.apply_async.return_value = Mock(id="task-123")
+        document_id = uuid.uuid4()
+        
+        task_id = dispatch_ocr_task(document_id)
+        
+        assert task_id == "task-123"
+        mock_task.apply_async.assert_called_once_with(
+            args=[str(document_id)], retry=True, retry_policy=DISPATCH_RETRY_POLICY
+        )
+
+
 class TestTaskIntegration:
     """Integration tests for the OCR task"""
     
@@ -394,10 +542,13 @@ class TestTaskIntegration:
         mock_client.extract_fields = mock_extract_fields
         
         # Mock get_db to return our test session
+        # The task commits and closes the session, expiring the instance
+        document_id = document.id
+        
         with patch('app.tasks.document_tasks.get_db') as mock_get_db:
             mock_get_db.return_value.__next__.return_value = db_session
             
-            result = process_document_ocr(document.id)
+            result = process_document_ocr(document_id)
         
         # Verify task result
         assert result["status"] == "completed"
@@ -405,13 +556,13 @@ class TestTaskIntegration:
         assert result["line_items_extracted"] == 1
         
         # Since the task uses a different db session, query for the document again
-        updated_doc = db_session.query(Document).filter(Document.id == document.id).first()
+        updated_doc = db_session.query(Document).filter(Document.id == document_id).first()
         assert updated_doc.status == DocumentStatus.COMPLETED
         assert updated_doc.confidence_score > 0.9
         
         # Verify extracted fields were saved
         extracted_fields = db_session.query(ExtractedField).filter(
-            ExtractedField.document_id == document.id
+            ExtractedField.document_id == document_id
         ).all()
         assert len(extracted_fields) == 1
         assert extracted_fields[0].field_name == "invoice_number"
@@ -419,7 +570,7 @@ class TestTaskIntegration:
         
         # Verify line items were saved
         line_items = db_session.query(LineItem).filter(
-            LineItem.document_id == document.id
+            LineItem.document_id == document_id
         ).all()
         assert len(line_items) == 1
         assert line_items[0].description == "Test Service"
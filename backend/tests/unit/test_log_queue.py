@@ -0,0 +1,52 @@
+"""
+Test queue-backed logging hands records to the background listener.
+"""
+import io
+import logging
+import sys
+from logging.handlers import QueueHandler
+
+from app.core import log_queue
+
+
+def test_configure_queue_logging_writes_from_listener(monkeypatch):
+    """Test records logged on the request thread reach the stream via the listener"""
+    root = logging.getLogger()
+    original_handlers = list(root.handlers)
+    original_level = root.level
+    monkeypatch.setattr(log_queue, "_listener", None)
+    stream = io.StringIO()
+
+    listener = log_queue.configure_queue_logging(
+        level=logging.INFO, fmt="%(levelname)s %(message)s", stream=stream
+    )
+    try:
+        assert log_queue.configure_queue_logging() is listener
+        assert any(isinstance(h, QueueHandler) for h in root.handlers)
+
+        logging.getLogger("app.test").info("Line item %s updated", 7)
+    finally:
+        log_queue.stop_queue_logging()
+        root.handlers[:] = original_handlers
+        root.setLevel(original_level)
+
+    assert stream.getvalue() == "INFO Line item 7 updated\n"
+
+
+
+def test_records_are_enqueued_unformatted():
+    """Test message merging and traceback rendering are left to the listener"""
+    handler = log_queue.DeferredFormatQueueHandler(None)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        exc_info = sys.exc_info()
+    record = logging.LogRecord(
+        "app.test", logging.ERROR, __file__, 1, "Document %s failed", ("abc",), exc_info
+    )
+
+    prepared = handler.prepare(record)
+
+    assert prepared.args == ("abc",)
+    assert prepared.exc_info is exc_info
+    assert prepared.exc_text is None
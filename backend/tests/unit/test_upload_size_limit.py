@@ -0,0 +1,80 @@
+"""
+Test the upload size limit middleware rejects oversize bodies before parsing.
+"""
+from typing import List
+
+from fastapi import FastAPI, File, Request, UploadFile
+from fastapi.testclient import TestClient
+from starlette.formparsers import MultiPartParser
+
+from app.core.uploads import MAX_FILE_SIZE, UploadSizeLimitMiddleware, configure_multipart_spooling
+
+BOUNDARY = "lexitau-test-boundary"
+
+
+def _make_client(max_body_size: int) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(UploadSizeLimitMiddleware, max_body_size=max_body_size)
+
+    @app.post("/documents/upload")
+    async def upload(files: List[UploadFile] = File(...)):
+        return {"received": [len(await file.read()) for file in files]}
+
+    @app.post("/other")
+    async def other(request: Request):
+        body = await request.body()
+        return {"received": len(body)}
+
+    return TestClient(app)
+
+
+def _multipart_body(content: bytes) -> bytes:
+    return (
+        f"--{BOUNDARY}\r\n"
+        'Content-Disposition: form-data; name="files"; filename="invoice.pdf"\r\n'
+        "Content-Type: application/pdf\r\n\r\n"
+    ).encode() + content + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+def test_rejects_declared_content_length_over_limit():
+    """Test requests declaring an oversize Content-Length get 413"""
+    client = _make_client(max_body_size=100)
+    response = client.post("/documents/upload", files={"files": ("invoice.pdf", b"x" * 200, "application/pdf")})
+    assert response.status_code == 413
+    assert "too large" in response.json()["detail"]
+
+
+def test_rejects_streamed_body_over_limit():
+    """Test chunked multipart bodies without Content-Length get 413, not a parse error"""
+    client = _make_client(max_body_size=100)
+    body = _multipart_body(b"x" * 500)
+
+    def chunks():
+        for start in range(0, len(body), 50):
+            yield body[start:start + 50]
+
+    response = client.post(
+        "/documents/upload",
+        content=chunks(),
+        headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"}
+    )
+    assert response.status_code == 413
+    assert "too large" in response.json()["detail"]
+
+
+def test_allows_body_within_limit_and_other_paths():
+    """Test bodies under the limit and unrelated routes pass through untouched"""
+    client = _make_client(max_body_size=1000)
+    response = client.post("/documents/upload", files={"files": ("invoice.pdf", b"x" * 100, "application/pdf")})
+    assert response.json() == {"received": [100]}
+    assert client.post("/other", content=b"x" * 5000).json() == {"received": 5000}
+
+
+def test_configure_multipart_spooling_raises_rollover_threshold():
+    """Test uploads up to MAX_FILE_SIZE are kept in memory by the form parser"""
+    original = MultiPartParser.max_file_size
+    try:
+        configure_multipart_spooling()
+        assert MultiPartParser.max_file_size == MAX_FILE_SIZE
+    finally:
+        MultiPartParser.max_file_size = original
@@ -1,7 +1,7 @@
 'use client'
 
 import { useState } from 'react'
-import { uploadDocuments } from '@/lib/api/documents'
+import { uploadDocuments, waitForUpload } from '@/lib/api/documents'
 import { Button } from '@/components/ui/button'
 import {
   Dialog,
@@ -24,6 +24,7 @@ interface DocumentUploadFormProps {
 export function DocumentUploadForm({ open, onOpenChange, onSuccess }: DocumentUploadFormProps) {
   const [files, setFiles] = useState<File[]>([])
   const [loading, setLoading] = useState(false)
+  const [registering, setRegistering] = useState(false)
   const [error, setError] = useState<string | null>(null)
   const router = useRouter()
 
@@ -73,6 +74,19 @@ export function DocumentUploadForm({ open, onOpenChange, onSuccess }: DocumentUp
 
       const response = await uploadDocuments(files)
 
+      // Uploads are registered by a background worker; for a single file, wait
+      // until its document exists before navigating to the detail page
+      let documentId: string | null = null
+      const result = response.results[0]
+      if (files.length === 1 && response.successful_uploads === 1 && result?.task_id) {
+        setRegistering(true)
+        const upload = await waitForUpload(result.task_id)
+        if (upload.state !== 'SUCCESS' || !upload.document_id) {
+          throw new Error(upload.error_message || 'Failed to process the uploaded document')
+        }
+        documentId = upload.document_id
+      }
+
       // Reset form
       setFiles([])
       onOpenChange(false)
@@ -80,15 +94,15 @@ export function DocumentUploadForm({ open, onOpenChange, onSuccess }: DocumentUp
       // Notify parent of success
       onSuccess?.()
 
-      // If single file and successful, navigate to the document detail page
-      if (files.length === 1 && response.successful_uploads === 1 && response.results[0]?.document_id) {
-        router.push(`/documents/${response.results[0].document_id}`)
+      if (documentId) {
+        router.push(`/documents/${documentId}`)
       }
 
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to upload documents')
     } finally {
       setLoading(false)
+      setRegistering(false)
     }
   }
 
@@ -153,7 +167,7 @@ export function DocumentUploadForm({ open, onOpenChange, onSuccess }: DocumentUp
               disabled={loading || files.length === 0}
             >
               {loading ? (
-                'Uploading...'
+                registering ? 'Processing...' : 'Uploading...'
               ) : (
                 <>
                   <Upload className="mr-2 h-4 w-4" />
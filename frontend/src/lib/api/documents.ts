@@ -43,6 +43,7 @@ export interface DocumentUploadResult {
   success: boolean;
   filename: string;
   document_id?: string | null;
+  task_id?: string | null;
   blob_url?: string | null;
   error_message?: string | null;
   file_size?: number | null;
@@ -56,6 +57,16 @@ export interface DocumentUploadResponse {
   results: DocumentUploadResult[];
 }
 
+export type UploadTaskState = "PENDING" | "STARTED" | "RETRY" | "SUCCESS" | "FAILURE";
+
+export interface UploadTaskStatus {
+  task_id: string;
+  state: UploadTaskState;
+  document_id?: string | null;  // set once the upload succeeded
+  blob_url?: string | null;
+  error_message?: string | null;
+}
+
 export interface ExtractedField {
   id: number;
   document_id: number;
@@ -137,6 +148,29 @@ export async function uploadDocuments(files: File[]): Promise<DocumentUploadResp
   return handleApiResponse<DocumentUploadResponse>(resp);
 }
 
+/** GET /documents/uploads/{task_id} via proxy */
+export async function fetchUploadStatus(taskId: string): Promise<UploadTaskStatus> {
+  const resp = await fetch(`/api/documents/uploads/${taskId}`, { method: "GET", cache: "no-store" });
+  return handleApiResponse<UploadTaskStatus>(resp);
+}
+
+/**
+ * Poll a queued upload until the worker has registered the document.
+ * Resolves with the final status (SUCCESS or FAILURE); rejects on timeout.
+ */
+export async function waitForUpload(
+  taskId: string,
+  { intervalMs = 1000, timeoutMs = 120_000 }: { intervalMs?: number; timeoutMs?: number } = {}
+): Promise<UploadTaskStatus> {
+  const deadline = Date.now() + timeoutMs;
+  for (;;) {
+    const status = await fetchUploadStatus(taskId);
+    if (status.state === "SUCCESS" || status.state === "FAILURE") return status;
+    if (Date.now() >= deadline) throw new Error("Upload is taking longer than expected. Check the documents list shortly.");
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
+}
+
 /** GET /documents/{id} via proxy */
 export async function fetchDocument(id: string): Promise<Document> {
   const resp = await fetch(`/api/documents/${id}`, { method: "GET", cache: "no-store" });